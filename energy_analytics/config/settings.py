@@ -3,13 +3,53 @@
 Configuration management for Energy Analytics Pipeline
 """
 
-import yaml
-from dataclasses import dataclass
+import copy
+import functools
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 
-@dataclass
+@functools.lru_cache(maxsize=None)
+def _yaml_codec():
+    """Import PyYAML on first use, preferring the libyaml-backed loader/dumper"""
+    import yaml
+    try:
+        from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+    except ImportError:
+        from yaml import SafeLoader as Loader, SafeDumper as Dumper
+    return yaml, Loader, Dumper
+
+
+@functools.lru_cache(maxsize=16)
+def _load_yaml(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a YAML file; cached per (path, mtime, size) so edits invalidate it"""
+    yaml, loader, _ = _yaml_codec()
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+# dataclass(slots=True) is only available from Python 3.10
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@functools.lru_cache(maxsize=8)
+def _build_config(cls, items: tuple):
+    """Construct a frozen config once per distinct set of values"""
+    return cls(**dict(items))
+
+
+def _config_from_dict(cls, config_dict: Dict[str, Any]):
+    """Return a shared config instance, building directly if a value is unhashable"""
+    try:
+        return _build_config(cls, tuple(sorted(config_dict.items())))
+    except TypeError:
+        return cls(**config_dict)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class DatabaseConfig:
     """Database configuration settings"""
     host: str = "localhost"
@@ -17,18 +57,26 @@ class DatabaseConfig:
     database: str = "energy_analytics"
     username: str = "energy_user"
     password: str = "123qwe"
+    _connection_string: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Instances are frozen, so the URL can be built once up front
+        object.__setattr__(
+            self, '_connection_string',
+            f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+        )
 
     @property
     def connection_string(self) -> str:
-        return f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+        return self._connection_string
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'DatabaseConfig':
         """Create DatabaseConfig from dictionary"""
-        return cls(**config_dict)
+        return _config_from_dict(cls, config_dict)
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class IngestionConfig:
     """Pipeline configuration settings"""
     batch_size: int = 1000
@@ -38,11 +86,62 @@ class IngestionConfig:
     data_retention_days: int = 1095  # 3 years
     enable_streaming: bool = True
     enable_monitoring: bool = True
+    cache_dir: str = 'cache'  # conditional-GET cache for large source downloads
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'IngestionConfig':
         """Create IngestionConfig from dictionary"""
-        return cls(**config_dict)
+        return _config_from_dict(cls, config_dict)
+
+
+# Weather location configuration
+WEATHER_LOCATIONS = {
+    'paris_france': {'lat': 48.8566, 'lon': 2.3522, 'location_id': 'paris_fr_001'},
+    'berlin_germany': {'lat': 52.5200, 'lon': 13.4050, 'location_id': 'berlin_de_001'},
+    'madrid_spain': {'lat': 40.4168, 'lon': -3.7038, 'location_id': 'madrid_es_001'}
+}
+
+# Shared, read-only default configuration; copied before being handed out
+_DEFAULT_CONFIG = MappingProxyType({
+    'database': {
+        'host': 'localhost',
+        'port': 5432,
+        'database': 'energy_analytics',
+        'username': 'energy_user',
+        'password': '123qwe'
+    },
+    'ingestion': {
+        'batch_size': 1000,
+        'max_retries': 3,
+        'retry_delay': 60,
+        'weather_api_delay': 0.1,
+        'data_retention_days': 1095,
+        'enable_streaming': True,
+        'enable_monitoring': True,
+        'cache_dir': 'cache'
+    },
+    'logging': {
+        'level': 'INFO',
+        'file': 'ingestion_pipeline.log',
+        'max_size_mb': 100,
+        'backup_count': 5
+    },
+    'data_sources': {
+        'uci_household': {
+            'url': 'https://archive.ics.uci.edu/static/public/235/individual+household+electric+power+consumption.zip',
+            'household_id': 'uci_france_001'
+        },
+        'weather_api': {
+            'base_url': 'https://archive-api.open-meteo.com/v1/era5',
+            'forecast_url': 'https://api.open-meteo.com/v1/forecast',
+            'locations': WEATHER_LOCATIONS
+        },
+        'grid_data': {
+            'opsd_url': 'https://data.open-power-system-data.org/time_series/latest/time_series_60min_singleindex.csv',
+            'entsoe_api': 'https://web-api.tp.entsoe.eu/api'
+        }
+    }
+})
 
 
 class ConfigManager:
@@ -55,14 +154,22 @@ class ConfigManager:
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         if self.config_path.exists():
-            with open(self.config_path, 'r') as f:
-                self.config_dict = yaml.safe_load(f)
+            st = self.config_path.stat()
+            parsed = _load_yaml(str(self.config_path.resolve()), st.st_mtime_ns, st.st_size)
+            # Hand out a private copy so callers cannot mutate the shared cache entry
+            self.config_dict = copy.deepcopy(parsed)
         return self.config_dict
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Drop all memoized configuration files"""
+        _load_yaml.cache_clear()
     
     def save_config(self, config_dict: Dict[str, Any]):
         """Save configuration to YAML file"""
+        yaml, _, dumper = _yaml_codec()
         with open(self.config_path, 'w') as f:
-            yaml.dump(config_dict, f, default_flow_style=False)
+            yaml.dump(config_dict, f, Dumper=dumper, default_flow_style=False)
     
     def get_database_config(self) -> DatabaseConfig:
         """Get database configuration"""
@@ -84,57 +191,6 @@ class ConfigManager:
     
     def create_default_config(self):
         """Create default configuration file"""
-        config = {
-            'database': {
-                'host': 'localhost',
-                'port': 5432,
-                'database': 'energy_analytics',
-                'username': 'energy_user',
-                'password': '123qwe'
-            },
-            'ingestion': {
-                'batch_size': 1000,
-                'max_retries': 3,
-                'retry_delay': 60,
-                'weather_api_delay': 0.1,
-                'data_retention_days': 1095,
-                'enable_streaming': True,
-                'enable_monitoring': True
-            },
-            'logging': {
-                'level': 'INFO',
-                'file': 'ingestion_pipeline.log',
-                'max_size_mb': 100,
-                'backup_count': 5
-            },
-            'data_sources': {
-                'uci_household': {
-                    'url': 'https://archive.ics.uci.edu/static/public/235/individual+household+electric+power+consumption.zip',
-                    'household_id': 'uci_france_001'
-                },
-                'weather_api': {
-                    'base_url': 'https://archive-api.open-meteo.com/v1/era5',
-                    'forecast_url': 'https://api.open-meteo.com/v1/forecast',
-                    'locations': {
-                        'paris': {'lat': 48.8566, 'lon': 2.3522, 'location_id': 'paris_fr_001'},
-                        'berlin': {'lat': 52.5200, 'lon': 13.4050, 'location_id': 'berlin_de_001'},
-                        'madrid': {'lat': 40.4168, 'lon': -3.7038, 'location_id': 'madrid_es_001'}
-                    }
-                },
-                'grid_data': {
-                    'opsd_url': 'https://data.open-power-system-data.org/time_series/latest/time_series_60min_singleindex.csv',
-                    'entsoe_api': 'https://web-api.tp.entsoe.eu/api'
-                }
-            }
-        }
-        
+        config = copy.deepcopy(dict(_DEFAULT_CONFIG))
         self.save_config(config)
         return config
-
-
-# Weather location configuration
-WEATHER_LOCATIONS = {
-    'paris_france': {'lat': 48.8566, 'lon': 2.3522, 'location_id': 'paris_fr_001'},
-    'berlin_germany': {'lat': 52.5200, 'lon': 13.4050, 'location_id': 'berlin_de_001'},
-    'madrid_spain': {'lat': 40.4168, 'lon': -3.7038, 'location_id': 'madrid_es_001'}
-}
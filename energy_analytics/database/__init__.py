@@ -6,10 +6,14 @@ from .models import (
     SCHEMA_DEFINITIONS,
     TABLE_DEFINITIONS,
     INDEX_DEFINITIONS,
+    CONSTRAINT_DEFINITIONS,
+    MIGRATION_DEFINITIONS,
     HOUSEHOLD_COLUMN_MAPPING,
     WEATHER_VARIABLE_MAPPING,
     OPSD_COLUMN_MAPPING,
-    WEATHER_VALIDATION_RANGES
+    WEATHER_VALIDATION_RANGES,
+    STAGING_TABLES,
+    QualityFlag
 )
 
 __all__ = [
@@ -18,8 +22,12 @@ __all__ = [
     'SCHEMA_DEFINITIONS',
     'TABLE_DEFINITIONS',
     'INDEX_DEFINITIONS',
+    'CONSTRAINT_DEFINITIONS',
+    'MIGRATION_DEFINITIONS',
     'HOUSEHOLD_COLUMN_MAPPING',
     'WEATHER_VARIABLE_MAPPING',
     'OPSD_COLUMN_MAPPING',
-    'WEATHER_VALIDATION_RANGES'
+    'WEATHER_VALIDATION_RANGES',
+    'STAGING_TABLES',
+    'QualityFlag'
 ]
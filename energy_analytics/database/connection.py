@@ -3,53 +3,201 @@
 Database connection and basic operations management
 """
 
+import atexit
+import csv
+import io
+import itertools
 import logging
+import threading
+import time
 from contextlib import contextmanager
-from typing import Optional, Any, List, Tuple, Dict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Any, List, Tuple, Dict, Set, Iterable, Iterator, Sequence
 from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.engine import Engine
-from sqlalchemy.pool import NullPool, QueuePool
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.sql.elements import TextClause
 
 from config.settings import DatabaseConfig
 
 logger = logging.getLogger(__name__)
 
+COPY_NULL = '\\N'
+
+# Frequently issued literal queries
+PING_SQL = "SELECT 1"
+INSTALLED_EXTENSIONS_SQL = "SELECT extname FROM pg_extension"
+
+
+@lru_cache(maxsize=256)
+def _compiled(sql: str) -> 'TextClause':
+    """Return a cached TextClause so bind parameters are parsed once per SQL string"""
+    return text(sql)
+
+
+# Server-side prepared INSERT/merge names keyed by (schema, table, columns, conflict clause)
+_PREPARED_NAMES: Dict[Tuple[str, str, Tuple[str, ...], str], str] = {}
+_prepared_ids = itertools.count()
+_prepared_lock = threading.Lock()
+
+def _prepared_name(prefix: str, key: Tuple[str, str, Tuple[str, ...], str]) -> str:
+    """Return the statement name for key, allocating a unique one on first use"""
+    with _prepared_lock:
+        name = _PREPARED_NAMES.get(key)
+        if name is None:
+            name = _PREPARED_NAMES[key] = f"{prefix}_{key[1]}_{next(_prepared_ids)}"
+        return name
+
+
+# Engines handed out by _engine_for, disposed once at interpreter exit
+_shared_engines: List['Engine'] = []
+
+
+@lru_cache(maxsize=8)
+def _engine_for(connection_string: str) -> 'Engine':
+    """Return the pooled engine shared by every DatabaseConnection using this connection string"""
+    engine = create_engine(
+        connection_string,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=10,
+        max_overflow=20,
+        # Let psycopg2 page executemany() calls instead of one round-trip per row
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=1000,
+        executemany_batch_page_size=500,
+        echo=False  # Set to True for SQL debugging
+    )
+    _shared_engines.append(engine)
+    return engine
+
+
+@atexit.register
+def _dispose_engines():
+    """Close pooled connections of all shared engines"""
+    while _shared_engines:
+        _shared_engines.pop().dispose()
+
+
+def _quote_ident(name: str) -> str:
+    """Quote an identifier the way psycopg2.sql.Identifier renders it"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+@lru_cache(maxsize=256)
+def _qualify(schema: str, table: str) -> str:
+    """Return the quoted schema-qualified name so each operation has one canonical SQL text"""
+    return f"{_quote_ident(schema)}.{_quote_ident(table)}"
+
+
+def _copy_value(value: Any) -> Any:
+    """Map None/NaN/NaT (values that never equal themselves) to the COPY NULL marker"""
+    try:
+        if value is None or value != value:
+            return COPY_NULL
+    except TypeError:
+        # pandas.NA refuses boolean coercion
+        return COPY_NULL
+    return value
+
+
+def _csv_buffer(rows: Iterable[Sequence[Any]]) -> Tuple[io.StringIO, int]:
+    """Serialize rows (or a DataFrame) into an in-memory CSV buffer for COPY; returns buffer and row count"""
+    buffer = io.StringIO()
+    if hasattr(rows, 'to_csv'):
+        # DataFrames are written column-wise by pandas' C writer, without per-cell Python objects
+        rows.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+        row_count = len(rows)
+    else:
+        writer = csv.writer(buffer)
+        row_count = 0
+        for row in rows:
+            writer.writerow([_copy_value(value) for value in row])
+            row_count += 1
+    buffer.seek(0)
+    return buffer, row_count
+
+
+def _copy_sql(target: str, columns: Sequence[str]) -> str:
+    """Build the COPY FROM STDIN statement matching _csv_buffer's format"""
+    return (
+        f"COPY {target} ({', '.join(map(_quote_ident, columns))}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+
 
 class DatabaseConnection:
     """Manages database connections and basic operations"""
 
     def __init__(self, config: DatabaseConfig):
         self.config = config
-        self.engine: Optional[Engine] = None
+        self.engine: Optional['Engine'] = None
+        # Last successful liveness probe; probes within the TTL are skipped
+        self._last_ok_ts = 0.0
+        self._ok_ttl = 5.0
+        # Catalog reflection is cached and refreshed after the TTL or on DDL
+        self._inspector = None
+        self._inspector_ts = 0.0
+        self._reflection_ttl = 60.0
+        self._index_cache: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._column_cache: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        # Installed extension names, loaded with one catalog query on first check
+        self._ext_cache: Optional[Set[str]] = None
+        # Long-lived AUTOCOMMIT connection reused by maintenance commands
+        self._maintenance_conn = None
+        self._maintenance_lock = threading.Lock()
 
     def connect(self) -> bool:
         """Establish database connection"""
         try:
-            # Create engine with connection pooling
-            self.engine = create_engine(
-                self.config.connection_string,
-                pool_pre_ping=True,
-                pool_recycle=300,
-                pool_size=10,
-                max_overflow=20,
-                echo=False  # Set to True for SQL debugging
-            )
+            # Pooled engine shared with other connections to the same database
+            self.engine = _engine_for(self.config.connection_string)
             # Test connection
             with self.engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
+                conn.execute(_compiled(PING_SQL))
+            self._last_ok_ts = time.monotonic()
             logger.info("Database connection established")
             return True
-        except Exception as e:
-            logger.error(f"Database connection failed: {e}")
+        except Exception:
+            logger.exception("Database connection failed")
             return False
 
     def disconnect(self):
-        """Close database connection"""
-        if self.engine:
-            self.engine.dispose()
-            self.engine = None
+        """Close database connection; the shared pool itself is disposed at process exit"""
+        with self._maintenance_lock:
+            if self._maintenance_conn is not None:
+                self._maintenance_conn.close()
+                self._maintenance_conn = None
+        self.engine = None
+        self._last_ok_ts = 0.0
+        self._inspector = None
+        self._index_cache.clear()
+        self._column_cache.clear()
+        self._ext_cache = None
         logger.info("Database connection closed")
 
+    def _get_inspector(self):
+        """Return the engine's reflection Inspector, dropping its cache once stale"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        now = time.monotonic()
+        if self._inspector is None:
+            self._inspector = inspect(self.engine)
+            self._inspector_ts = now
+        elif now - self._inspector_ts > self._reflection_ttl:
+            self.invalidate_reflection_cache()
+            self._inspector_ts = now
+        return self._inspector
+
+    def invalidate_reflection_cache(self):
+        """Forget cached table, column and index metadata"""
+        if self._inspector is not None:
+            self._inspector.clear_cache()
+        self._index_cache.clear()
+        self._column_cache.clear()
+
     @contextmanager
     def get_connection(self):
         """Context manager for database connections"""
@@ -62,6 +210,26 @@ class DatabaseConnection:
         finally:
             conn.close()
 
+    @contextmanager
+    def _maintenance(self):
+        """Context manager yielding the shared AUTOCOMMIT connection for admin commands"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        with self._maintenance_lock:
+            if self._maintenance_conn is None or self._maintenance_conn.closed:
+                self._maintenance_conn = self.engine.connect().execution_options(
+                    isolation_level="AUTOCOMMIT"
+                )
+            try:
+                yield self._maintenance_conn
+            except Exception:
+                # Don't keep a connection around that may be in a broken state
+                self._maintenance_conn.invalidate()
+                self._maintenance_conn.close()
+                self._maintenance_conn = None
+                raise
+
     @contextmanager
     def begin_transaction(self):
         """Context manager for database transactions"""
@@ -77,7 +245,7 @@ class DatabaseConnection:
             raise RuntimeError("Database not connected")
 
         with self.engine.connect() as conn:
-            result = conn.execute(text(query), params or {})
+            result = conn.execute(_compiled(query), params or {})
             return result
 
     def execute_transaction(self, query: str, params: Optional[dict] = None) -> Any:
@@ -86,9 +254,26 @@ class DatabaseConnection:
             raise RuntimeError("Database not connected")
 
         with self.engine.begin() as conn:
-            result = conn.execute(text(query), params or {})
+            result = conn.execute(_compiled(query), params or {})
             return result
 
+    def execute_batch(self, statements: Sequence[str]) -> List[Optional[Exception]]:
+        """Run statements in one transaction, each under a SAVEPOINT; returns per-statement errors"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        errors: List[Optional[Exception]] = []
+        with self.engine.begin() as conn:
+            for statement in statements:
+                try:
+                    # A failing statement only rolls back to its own savepoint
+                    with conn.begin_nested():
+                        conn.execute(_compiled(statement))
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(e)
+        return errors
+
     def execute_many(self, query: str, data: List[dict]) -> int:
         """Execute a query with multiple parameter sets"""
         if not self.engine:
@@ -98,19 +283,9 @@ class DatabaseConnection:
             return 0
 
         with self.engine.begin() as conn:
-            # Convert query to use bindparams if needed
-            stmt = text(query)
-
-            # Execute in batches for better performance
-            batch_size = 1000
-            total_affected = 0
-
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i + batch_size]
-                result = conn.execute(stmt, batch)
-                total_affected += result.rowcount
-
-            return total_affected
+            # A single executemany call; the driver pages the parameter sets itself
+            result = conn.execute(_compiled(query), data)
+            return result.rowcount
 
     def execute_batch_insert(self, table: str, schema: str, data: List[dict]) -> int:
         """Execute batch insert using SQLAlchemy's executemany"""
@@ -123,15 +298,187 @@ class DatabaseConnection:
         # Build insert statement dynamically
         columns = list(data[0].keys())
         placeholders = ', '.join([f":{col}" for col in columns])
-        column_names = ', '.join(columns)
+        column_names = ', '.join(_quote_ident(col) for col in columns)
 
         insert_sql = f"""
-            INSERT INTO {schema}.{table} ({column_names})
+            INSERT INTO {_qualify(schema, table)} ({column_names})
             VALUES ({placeholders})
         """
 
         return self.execute_many(insert_sql, data)
 
+    def execute_prepared(self, table: str, schema: str, columns: List[str],
+                         rows: Iterable[Sequence[Any]], on_conflict: str = "",
+                         page_size: int = 500) -> int:
+        """Insert rows through a server-side prepared statement, prepared once per pooled connection"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        key = (schema, table, tuple(columns), on_conflict)
+        name = _prepared_name('ins', key)
+        placeholders = ', '.join(['%s'] * len(columns))
+
+        # The driver is imported by the engine on connect; mirror that here
+        from psycopg2.extras import execute_batch
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            # Prepared statements live in the session, so track them per DBAPI connection
+            prepared = raw_conn.info.setdefault('prepared_statements', set())
+            cursor = raw_conn.cursor()
+            if name not in prepared:
+                params = ', '.join(f"${i}" for i in range(1, len(columns) + 1))
+                cursor.execute(
+                    f"PREPARE {name} AS INSERT INTO {_qualify(schema, table)} "
+                    f"({', '.join(map(_quote_ident, columns))}) VALUES ({params}) {on_conflict}"
+                )
+                prepared.add(name)
+
+            rows = list(rows)
+            # Pages of EXECUTE calls are sent as one multi-statement round-trip
+            execute_batch(cursor, f"EXECUTE {name} ({placeholders})", rows, page_size=page_size)
+            cursor.close()
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+        return len(rows)
+
+    def execute_values(self, table: str, schema: str, columns: List[str],
+                       rows: Iterable[Sequence[Any]], conflict_columns: Optional[List[str]] = None,
+                       update_set: Optional[str] = None, page_size: int = 40) -> int:
+        """Insert rows as multi-row VALUES statements, optionally with ON CONFLICT handling"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        on_conflict = ""
+        if conflict_columns:
+            action = f"DO UPDATE SET {update_set}" if update_set else "DO NOTHING"
+            on_conflict = f"ON CONFLICT ({', '.join(map(_quote_ident, conflict_columns))}) {action}"
+
+        # The driver is imported by the engine on connect; mirror that here
+        from psycopg2.extras import execute_values
+
+        rows = list(rows)
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            # One statement per page_size rows: INSERT ... VALUES (...), (...), ...
+            execute_values(
+                cursor,
+                f"INSERT INTO {_qualify(schema, table)} ({', '.join(map(_quote_ident, columns))}) "
+                f"VALUES %s {on_conflict}",
+                rows,
+                page_size=page_size
+            )
+            cursor.close()
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+        return len(rows)
+
+    def copy_insert(self, table: str, schema: str, columns: List[str],
+                    rows: Iterable[Sequence[Any]]) -> int:
+        """Bulk load rows with COPY FROM STDIN; much faster than INSERT for large loads"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        buffer, row_count = _csv_buffer(rows)
+        if not row_count:
+            return 0
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.copy_expert(_copy_sql(_qualify(schema, table), columns), buffer)
+            cursor.close()
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+        return row_count
+
+    def copy_upsert(self, table: str, schema: str, columns: List[str],
+                    rows: Iterable[Sequence[Any]], conflict_columns: List[str],
+                    update_columns: Optional[List[str]] = None,
+                    stage_table: Optional[str] = None,
+                    conflict_where: Optional[str] = None) -> int:
+        """COPY rows into a staging table, then merge them with INSERT ... ON CONFLICT;
+        conflict_where is the predicate of a partial unique index on conflict_columns"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        buffer, row_count = _csv_buffer(rows)
+        if not row_count:
+            return 0
+
+        # Use the pre-created UNLOGGED stage in the same schema, else a per-transaction temp table
+        stage = _qualify(schema, stage_table) if stage_table else _quote_ident(f"_stage_{table}")
+        column_list = ', '.join(map(_quote_ident, columns))
+        if update_columns:
+            action = "DO UPDATE SET " + ", ".join(
+                f"{col} = EXCLUDED.{col}" for col in map(_quote_ident, update_columns)
+            )
+        else:
+            action = "DO NOTHING"
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            if stage_table:
+                # TRUNCATE locks the shared stage until commit, so concurrent loaders queue
+                # here instead of deadlocking on the TRUNCATE after the merge
+                cursor.execute(f"TRUNCATE {stage}")
+            else:
+                # Only the loaded columns, without constraints, so columns left to the
+                # target's identity or defaults can't fail NOT NULL in the stage
+                cursor.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DROP AS "
+                    f"SELECT {column_list} FROM {_qualify(schema, table)} WITH NO DATA"
+                )
+            cursor.copy_expert(_copy_sql(stage, columns), buffer)
+
+            # The merge is prepared once per pooled connection and re-executed on later loads
+            conflict_list = ', '.join(map(_quote_ident, conflict_columns))
+            predicate = f" WHERE {conflict_where}" if conflict_where else ""
+            conflict = f"ON CONFLICT ({conflict_list}){predicate} {action}"
+            key = (schema, table, tuple(columns), f"{stage} {conflict}")
+            name = _prepared_name('merge', key)
+            prepared = raw_conn.info.setdefault('prepared_statements', set())
+            if name not in prepared:
+                cursor.execute(
+                    f"PREPARE {name} AS INSERT INTO {_qualify(schema, table)} ({column_list}) "
+                    # One row per key, or DO UPDATE fails with "cannot affect row a second time";
+                    # the row copied last (highest ctid) wins
+                    f"SELECT DISTINCT ON ({conflict_list}) {column_list} FROM {stage} "
+                    f"ORDER BY {conflict_list}, ctid DESC {conflict}"
+                )
+                prepared.add(name)
+            cursor.execute(f"EXECUTE {name}")
+            merged = cursor.rowcount
+            if stage_table:
+                # The stage has autovacuum off, so it is emptied without leaving dead tuples
+                cursor.execute(f"TRUNCATE {stage}")
+            cursor.close()
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+        return merged
+
     def fetch_one(self, query: str, params: Optional[dict] = None) -> Optional[Tuple]:
         """Execute query and fetch one result"""
         result = self.execute_query(query, params)
@@ -142,11 +489,35 @@ class DatabaseConnection:
         result = self.execute_query(query, params)
         return result.fetchall()
 
+    def fetch_scalar(self, query: str, params: Optional[dict] = None) -> Any:
+        """Execute query and return the first column of the first row"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        with self.engine.connect() as conn:
+            return conn.execute(_compiled(query), params or {}).scalar()
+
     def fetch_dict(self, query: str, params: Optional[dict] = None) -> List[Dict[str, Any]]:
         """Execute query and return results as list of dictionaries"""
-        result = self.execute_query(query, params)
-        columns = result.keys()
-        return [dict(zip(columns, row)) for row in result.fetchall()]
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        with self.engine.connect() as conn:
+            result = conn.execute(_compiled(query), params or {})
+            return [dict(row) for row in result.mappings()]
+
+    def iter_dicts(self, query: str, params: Optional[dict] = None,
+                   chunk: int = 10_000) -> Iterator[Dict[str, Any]]:
+        """Stream query results as dictionaries through a server-side cursor; use for bulk reads"""
+        if not self.engine:
+            raise RuntimeError("Database not connected")
+
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, yield_per=chunk)
+            result = conn.execute(_compiled(query), params or {})
+            for partition in result.mappings().partitions():
+                for row in partition:
+                    yield dict(row)
 
     def test_connection(self) -> bool:
         """Test if database connection is active"""
@@ -154,59 +525,69 @@ class DatabaseConnection:
             if not self.engine:
                 return False
 
+            now = time.monotonic()
+            if now - self._last_ok_ts < self._ok_ttl:
+                return True
+
             with self.engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
+                conn.execute(_compiled(PING_SQL))
+            self._last_ok_ts = now
             return True
         except Exception:
+            self._last_ok_ts = 0.0
             return False
 
     def check_extension(self, extension_name: str) -> bool:
         """Check if a PostgreSQL extension is installed"""
         try:
-            result = self.execute_query(
-                "SELECT 1 FROM pg_extension WHERE extname = :ext_name",
-                {"ext_name": extension_name}
-            )
-            return result.rowcount > 0
-        except Exception as e:
-            logger.error(f"Error checking extension {extension_name}: {e}")
+            if self._ext_cache is None:
+                self._ext_cache = {row[0] for row in self.fetch_all(INSTALLED_EXTENSIONS_SQL)}
+            return extension_name in self._ext_cache
+        except Exception:
+            logger.exception("Error checking extension %s", extension_name)
             return False
 
     def install_extension(self, extension_name: str) -> bool:
         """Install a PostgreSQL extension"""
+        return self.install_extensions([extension_name])[extension_name]
+
+    def install_extensions(self, extension_names: Sequence[str]) -> Dict[str, bool]:
+        """Install several PostgreSQL extensions in one transaction; returns success per extension"""
+        if not extension_names:
+            return {}
+
         try:
-            self.execute_transaction(f"CREATE EXTENSION IF NOT EXISTS {extension_name}")
-            logger.info(f"Installed extension: {extension_name}")
-            return True
+            errors = self.execute_batch(
+                [f"CREATE EXTENSION IF NOT EXISTS {_quote_ident(name)}" for name in extension_names]
+            )
         except Exception as e:
-            logger.warning(f"Could not install extension {extension_name}: {e}")
-            return False
+            errors = [e] * len(extension_names)
+
+        results = {}
+        for name, error in zip(extension_names, errors):
+            if error is None:
+                if self._ext_cache is not None:
+                    self._ext_cache.add(name)
+                logger.info("Installed extension: %s", name)
+            else:
+                logger.warning("Could not install extension %s: %s", name, error)
+            results[name] = error is None
+        return results
 
     def table_exists(self, schema: str, table: str) -> bool:
         """Check if a table exists"""
         try:
-            result = self.execute_query(
-                """
-                SELECT 1
-                FROM information_schema.tables
-                WHERE table_schema = :schema
-                  AND table_name = :table
-                """,
-                {"schema": schema, "table": table}
-            )
-            return result.rowcount > 0
-        except Exception as e:
-            logger.error(f"Error checking table {schema}.{table}: {e}")
+            return self._get_inspector().has_table(table, schema=schema)
+        except Exception:
+            logger.exception("Error checking table %s.%s", schema, table)
             return False
 
     def get_table_count(self, schema: str, table: str) -> int:
         """Get row count for a table"""
         try:
-            result = self.execute_query(f"SELECT COUNT(*) FROM {schema}.{table}")
-            row = result.fetchone()
-            return row[0] if row else 0
-        except Exception as e:
-            logger.error(f"Error getting count for {schema}.{table}: {e}")
+            return self.fetch_scalar(f"SELECT COUNT(*) FROM {_qualify(schema, table)}") or 0
+        except Exception:
+            logger.exception("Error getting count for %s.%s", schema, table)
             return 0
 
     def get_table_size(self, schema: str, table: str) -> Dict[str, Any]:
@@ -233,8 +614,8 @@ class DatabaseConnection:
                 }
             return {}
 
-        except Exception as e:
-            logger.error(f"Error getting size for {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error getting size for %s.%s", schema, table)
             return {}
 
     def get_hypertables(self) -> List[Tuple[str, int]]:
@@ -255,53 +636,59 @@ class DatabaseConnection:
                 """
             )
             return [(row[0], row[1]) for row in result]
-        except Exception as e:
-            logger.error(f"Error getting hypertables: {e}")
+        except Exception:
+            logger.exception("Error getting hypertables")
             return []
 
     def get_table_columns(self, schema: str, table: str) -> List[Dict[str, Any]]:
         """Get column information for a table"""
         try:
+            # information_schema keeps "type" as its data_type string (e.g. "timestamp with
+            # time zone", "real"), which SQLAlchemy's reflected types do not round-trip;
+            # results share the inspector's TTL
+            self._get_inspector()
+            cached = self._column_cache.get((schema, table))
+            if cached is not None:
+                return cached
+
             query = """
-                    SELECT column_name, \
-                           data_type, \
-                           is_nullable, \
-                           column_default, \
-                           character_maximum_length, \
-                           numeric_precision, \
-                           numeric_scale
+                    SELECT column_name AS name, \
+                           data_type AS type, \
+                           is_nullable = 'YES' AS nullable, \
+                           column_default AS default, \
+                           character_maximum_length AS max_length, \
+                           numeric_precision AS precision, \
+                           numeric_scale AS scale, \
+                           is_identity = 'YES' AS identity, \
+                           is_generated = 'ALWAYS' AS computed
                     FROM information_schema.columns
                     WHERE table_schema = :schema
                       AND table_name = :table
                     ORDER BY ordinal_position \
                     """
 
-            result = self.execute_query(query, {"schema": schema, "table": table})
-
-            columns = []
-            for row in result:
-                columns.append({
-                    "name": row[0],
-                    "type": row[1],
-                    "nullable": row[2] == 'YES',
-                    "default": row[3],
-                    "max_length": row[4],
-                    "precision": row[5],
-                    "scale": row[6]
-                })
-
+            columns = self.fetch_dict(query, {"schema": schema, "table": table})
+            self._column_cache[(schema, table)] = columns
             return columns
 
-        except Exception as e:
-            logger.error(f"Error getting columns for {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error getting columns for %s.%s", schema, table)
             return []
 
     def get_table_indexes(self, schema: str, table: str) -> List[Dict[str, Any]]:
         """Get index information for a table"""
         try:
+            # pg_indexes carries the full definitions Inspector.get_indexes() lacks,
+            # so it stays the source; results share the inspector's TTL
+            self._get_inspector()
+            cached = self._index_cache.get((schema, table))
+            if cached is not None:
+                return cached
+
+            # Column aliases match the returned keys so rows map straight to dicts
             query = """
-                    SELECT indexname, \
-                           indexdef, \
+                    SELECT indexname AS name, \
+                           indexdef AS definition, \
                            tablespace
                     FROM pg_indexes
                     WHERE schemaname = :schema
@@ -309,20 +696,12 @@ class DatabaseConnection:
                     ORDER BY indexname \
                     """
 
-            result = self.execute_query(query, {"schema": schema, "table": table})
-
-            indexes = []
-            for row in result:
-                indexes.append({
-                    "name": row[0],
-                    "definition": row[1],
-                    "tablespace": row[2]
-                })
-
+            indexes = self.fetch_dict(query, {"schema": schema, "table": table})
+            self._index_cache[(schema, table)] = indexes
             return indexes
 
-        except Exception as e:
-            logger.error(f"Error getting indexes for {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error getting indexes for %s.%s", schema, table)
             return []
 
     def get_database_size(self) -> Dict[str, Any]:
@@ -345,45 +724,46 @@ class DatabaseConnection:
                 }
             return {}
 
-        except Exception as e:
-            logger.error(f"Error getting database size: {e}")
+        except Exception:
+            logger.exception("Error getting database size")
             return {}
 
     def vacuum_table(self, schema: str, table: str, analyze: bool = True) -> bool:
         """Vacuum a table to reclaim storage"""
         try:
-            vacuum_cmd = f"VACUUM {'ANALYZE' if analyze else ''} {schema}.{table}"
+            vacuum_cmd = f"VACUUM {'ANALYZE' if analyze else ''} {_qualify(schema, table)}"
 
             # VACUUM cannot run inside a transaction block
-            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
-                conn.execute(text(vacuum_cmd))
+            with self._maintenance() as conn:
+                conn.execute(_compiled(vacuum_cmd))
 
-            logger.info(f"Vacuumed table {schema}.{table}")
+            logger.info("Vacuumed table %s.%s", schema, table)
             return True
 
-        except Exception as e:
-            logger.error(f"Error vacuuming {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error vacuuming %s.%s", schema, table)
             return False
 
     def analyze_table(self, schema: str, table: str) -> bool:
         """Update table statistics"""
         try:
-            self.execute_transaction(f"ANALYZE {schema}.{table}")
-            logger.info(f"Analyzed table {schema}.{table}")
+            with self._maintenance() as conn:
+                conn.execute(_compiled(f"ANALYZE {_qualify(schema, table)}"))
+            logger.info("Analyzed table %s.%s", schema, table)
             return True
-        except Exception as e:
-            logger.error(f"Error analyzing {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error analyzing %s.%s", schema, table)
             return False
 
     def truncate_table(self, schema: str, table: str, cascade: bool = False) -> bool:
         """Truncate a table"""
         try:
             cascade_clause = "CASCADE" if cascade else ""
-            self.execute_transaction(f"TRUNCATE TABLE {schema}.{table} {cascade_clause}")
-            logger.info(f"Truncated table {schema}.{table}")
+            self.execute_transaction(f"TRUNCATE TABLE {_qualify(schema, table)} {cascade_clause}")
+            logger.info("Truncated table %s.%s", schema, table)
             return True
-        except Exception as e:
-            logger.error(f"Error truncating {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error truncating %s.%s", schema, table)
             return False
 
     def create_index(self, schema: str, table: str, index_name: str,
@@ -396,27 +776,29 @@ class DatabaseConnection:
             where = f"WHERE {where_clause}" if where_clause else ""
 
             index_sql = f"""
-                CREATE {unique_clause} INDEX IF NOT EXISTS {index_name}
-                ON {schema}.{table} ({column_list})
+                CREATE {unique_clause} INDEX IF NOT EXISTS {_quote_ident(index_name)}
+                ON {_qualify(schema, table)} ({column_list})
                 {where}
             """
 
             self.execute_transaction(index_sql)
-            logger.info(f"Created index {index_name} on {schema}.{table}")
+            self.invalidate_reflection_cache()
+            logger.info("Created index %s on %s.%s", index_name, schema, table)
             return True
 
-        except Exception as e:
-            logger.error(f"Error creating index {index_name}: {e}")
+        except Exception:
+            logger.exception("Error creating index %s", index_name)
             return False
 
     def drop_index(self, schema: str, index_name: str) -> bool:
         """Drop an index"""
         try:
-            self.execute_transaction(f"DROP INDEX IF EXISTS {schema}.{index_name}")
-            logger.info(f"Dropped index {schema}.{index_name}")
+            self.execute_transaction(f"DROP INDEX IF EXISTS {_qualify(schema, index_name)}")
+            self.invalidate_reflection_cache()
+            logger.info("Dropped index %s.%s", schema, index_name)
             return True
-        except Exception as e:
-            logger.error(f"Error dropping index {schema}.{index_name}: {e}")
+        except Exception:
+            logger.exception("Error dropping index %s.%s", schema, index_name)
             return False
 
     def get_active_connections(self) -> List[Dict[str, Any]]:
@@ -454,18 +836,18 @@ class DatabaseConnection:
 
             return connections
 
-        except Exception as e:
-            logger.error(f"Error getting active connections: {e}")
+        except Exception:
+            logger.exception("Error getting active connections")
             return []
 
     def kill_connection(self, pid: int) -> bool:
         """Terminate a database connection"""
         try:
             self.execute_query("SELECT pg_terminate_backend(:pid)", {"pid": pid})
-            logger.info(f"Terminated connection with PID {pid}")
+            logger.info("Terminated connection with PID %s", pid)
             return True
-        except Exception as e:
-            logger.error(f"Error terminating connection {pid}: {e}")
+        except Exception:
+            logger.exception("Error terminating connection %s", pid)
             return False
 
     def backup_table(self, schema: str, table: str, backup_suffix: str = "_backup") -> bool:
@@ -474,43 +856,100 @@ class DatabaseConnection:
             backup_table = f"{table}{backup_suffix}"
 
             # Drop backup table if exists
-            self.execute_transaction(f"DROP TABLE IF EXISTS {schema}.{backup_table}")
+            self.execute_transaction(f"DROP TABLE IF EXISTS {_qualify(schema, backup_table)}")
 
             # Create backup
             self.execute_transaction(
-                f"CREATE TABLE {schema}.{backup_table} AS SELECT * FROM {schema}.{table}"
+                f"CREATE TABLE {_qualify(schema, backup_table)} AS SELECT * FROM {_qualify(schema, table)}"
             )
+            self.invalidate_reflection_cache()
 
-            logger.info(f"Created backup table {schema}.{backup_table}")
+            logger.info("Created backup table %s.%s", schema, backup_table)
             return True
 
-        except Exception as e:
-            logger.error(f"Error backing up {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error backing up %s.%s", schema, table)
             return False
 
+    def _first_timestamp_col(self, schema: str, table: str) -> Optional[str]:
+        """Return the first timestamp/timestamptz column of a table, looked up in pg_attribute"""
+        query = """
+            SELECT a.attname
+            FROM pg_attribute a
+            JOIN pg_type t ON a.atttypid = t.oid
+            WHERE a.attrelid = CAST(:qualified_name AS regclass)
+              AND t.typname LIKE 'timestamp%'
+              AND a.attnum > 0
+              AND NOT a.attisdropped
+            ORDER BY a.attnum
+            LIMIT 1
+        """
+        return self.fetch_scalar(query, {"qualified_name": _qualify(schema, table)})
+
     def get_table_statistics(self, schema: str, table: str) -> Dict[str, Any]:
         """Get detailed statistics for a table"""
         try:
+            # Count, sizes, column and index counts in a single round-trip
+            stats_query = f"""
+                WITH row_count AS (
+                    SELECT COUNT(*) AS n FROM {_qualify(schema, table)}
+                ),
+                column_count AS (
+                    SELECT COUNT(*) AS n
+                    FROM information_schema.columns
+                    WHERE table_schema = :schema
+                      AND table_name = :table
+                ),
+                index_count AS (
+                    SELECT COUNT(*) AS n
+                    FROM pg_indexes
+                    WHERE schemaname = :schema
+                      AND tablename = :table
+                ),
+                rel AS (
+                    SELECT CAST(:qualified_name AS regclass) AS oid
+                )
+                SELECT row_count.n,
+                       pg_size_pretty(pg_total_relation_size(rel.oid)),
+                       pg_size_pretty(pg_relation_size(rel.oid)),
+                       pg_size_pretty(pg_indexes_size(rel.oid)),
+                       pg_total_relation_size(rel.oid),
+                       column_count.n,
+                       index_count.n
+                FROM row_count, column_count, index_count, rel
+            """
+
+            result = self.fetch_one(
+                stats_query,
+                {"schema": schema, "table": table, "qualified_name": _qualify(schema, table)}
+            )
+            if not result:
+                return {}
+
             stats = {
-                "row_count": self.get_table_count(schema, table),
-                "size": self.get_table_size(schema, table),
-                "columns": len(self.get_table_columns(schema, table)),
-                "indexes": len(self.get_table_indexes(schema, table))
+                "row_count": result[0] or 0,
+                "size": {
+                    "total_size": result[1],
+                    "table_size": result[2],
+                    "indexes_size": result[3],
+                    "total_bytes": result[4]
+                },
+                "columns": result[5],
+                "indexes": result[6]
             }
 
-            # Get date range for time-series tables
-            if self.table_exists(schema, table):
-                columns = self.get_table_columns(schema, table)
-                timestamp_cols = [col['name'] for col in columns
-                                  if 'timestamp' in col['type'].lower()]
+            # Get date range for time-series tables (the query above proved the table exists)
+            if stats["columns"]:
+                timestamp_col = self._first_timestamp_col(schema, table)
 
-                if timestamp_cols:
+                if timestamp_col:
+                    ts_col = _quote_ident(timestamp_col)
                     date_query = f"""
                         SELECT 
-                            MIN({timestamp_cols[0]})::date as min_date,
-                            MAX({timestamp_cols[0]})::date as max_date,
-                            MAX({timestamp_cols[0]}) - MIN({timestamp_cols[0]}) as date_range
-                        FROM {schema}.{table}
+                            MIN({ts_col})::date as min_date,
+                            MAX({ts_col})::date as max_date,
+                            MAX({ts_col}) - MIN({ts_col}) as date_range
+                        FROM {_qualify(schema, table)}
                     """
 
                     result = self.fetch_one(date_query)
@@ -523,8 +962,8 @@ class DatabaseConnection:
 
             return stats
 
-        except Exception as e:
-            logger.error(f"Error getting statistics for {schema}.{table}: {e}")
+        except Exception:
+            logger.exception("Error getting statistics for %s.%s", schema, table)
             return {}
 
     def explain_query(self, query: str, params: Optional[dict] = None,
@@ -537,8 +976,8 @@ class DatabaseConnection:
             result = self.execute_query(explain_query, params)
             return [row[0] for row in result]
 
-        except Exception as e:
-            logger.error(f"Error explaining query: {e}")
+        except Exception:
+            logger.exception("Error explaining query")
             return []
 
     def get_slow_queries(self, duration_ms: int = 1000) -> List[Dict[str, Any]]:
@@ -576,6 +1015,6 @@ class DatabaseConnection:
 
             return slow_queries
 
-        except Exception as e:
-            logger.error(f"Error getting slow queries: {e}")
+        except Exception:
+            logger.exception("Error getting slow queries")
             return []
\ No newline at end of file
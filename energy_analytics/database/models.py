@@ -3,6 +3,29 @@
 Database model definitions and SQL statements
 """
 
+from enum import IntFlag
+
+
+class QualityFlag(IntFlag):
+    """Bits stored in the INTEGER quality_flags column of the hypertables"""
+    NONE = 0
+    MISSING_VALUE = 1
+    OUT_OF_RANGE = 2
+    INTERPOLATED = 4
+    SYNTHETIC = 8
+
+
+# Server-derived total of the grid generation columns
+TOTAL_GENERATION_COLUMN = """DOUBLE PRECISION GENERATED ALWAYS AS (
+            COALESCE(solar_generation_actual_mw, 0) +
+            COALESCE(wind_onshore_generation_actual_mw, 0) +
+            COALESCE(wind_offshore_generation_actual_mw, 0) +
+            COALESCE(hydro_generation_actual_mw, 0) +
+            COALESCE(nuclear_generation_actual_mw, 0) +
+            COALESCE(fossil_generation_actual_mw, 0) +
+            COALESCE(other_renewable_generation_mw, 0)
+        ) STORED"""
+
 # Schema creation SQL
 SCHEMA_DEFINITIONS = """
 -- Create schemas for data organization
@@ -19,15 +42,15 @@ TABLE_DEFINITIONS = [
     CREATE TABLE IF NOT EXISTS household.consumption (
         timestamp TIMESTAMPTZ NOT NULL,
         household_id TEXT NOT NULL DEFAULT 'uci_france_001',
-        global_active_power DECIMAL(8,3),
-        global_reactive_power DECIMAL(8,3),
-        voltage DECIMAL(6,2),
-        global_intensity DECIMAL(6,2),
-        sub_metering_1 DECIMAL(8,2),
-        sub_metering_2 DECIMAL(8,2),
-        sub_metering_3 DECIMAL(8,2),
-        calculated_other_consumption DECIMAL(8,2),
-        data_quality_score DECIMAL(3,2) DEFAULT 1.0,
+        global_active_power REAL,
+        global_reactive_power REAL,
+        voltage REAL,
+        global_intensity REAL,
+        sub_metering_1 REAL,
+        sub_metering_2 REAL,
+        sub_metering_3 REAL,
+        calculated_other_consumption REAL,
+        data_quality_score REAL DEFAULT 1.0,
         ingestion_timestamp TIMESTAMPTZ DEFAULT NOW(),
         source_file TEXT,
         PRIMARY KEY (timestamp, household_id)
@@ -52,25 +75,25 @@ TABLE_DEFINITIONS = [
     """,
     
     # Grid operations table
-    """
+    f"""
     CREATE TABLE IF NOT EXISTS grid.operations (
         timestamp TIMESTAMPTZ NOT NULL,
         country_code TEXT NOT NULL,
         region_code TEXT,
-        load_actual_mw DECIMAL(10,2),
-        load_forecast_mw DECIMAL(10,2),
-        solar_generation_actual_mw DECIMAL(10,2),
-        wind_onshore_generation_actual_mw DECIMAL(10,2),
-        wind_offshore_generation_actual_mw DECIMAL(10,2),
-        hydro_generation_actual_mw DECIMAL(10,2),
-        nuclear_generation_actual_mw DECIMAL(10,2),
-        fossil_generation_actual_mw DECIMAL(10,2),
-        other_renewable_generation_mw DECIMAL(10,2),
-        total_generation_mw DECIMAL(10,2),
-        net_import_export_mw DECIMAL(10,2),
-        carbon_intensity_g_co2_kwh DECIMAL(6,2),
+        load_actual_mw DOUBLE PRECISION,
+        load_forecast_mw DOUBLE PRECISION,
+        solar_generation_actual_mw DOUBLE PRECISION,
+        wind_onshore_generation_actual_mw DOUBLE PRECISION,
+        wind_offshore_generation_actual_mw DOUBLE PRECISION,
+        hydro_generation_actual_mw DOUBLE PRECISION,
+        nuclear_generation_actual_mw DOUBLE PRECISION,
+        fossil_generation_actual_mw DOUBLE PRECISION,
+        other_renewable_generation_mw DOUBLE PRECISION,
+        total_generation_mw {TOTAL_GENERATION_COLUMN},
+        net_import_export_mw DOUBLE PRECISION,
+        carbon_intensity_g_co2_kwh REAL,
         price_day_ahead_eur_mwh DECIMAL(8,2),
-        data_quality_flags JSONB,
+        quality_flags INTEGER NOT NULL DEFAULT 0,
         ingestion_timestamp TIMESTAMPTZ DEFAULT NOW(),
         source TEXT DEFAULT 'ENTSO-E',
         PRIMARY KEY (timestamp, country_code, region_code)
@@ -83,7 +106,12 @@ TABLE_DEFINITIONS = [
         region_code TEXT PRIMARY KEY,
         country_code TEXT NOT NULL,
         tso_name TEXT,
-        installed_capacity_mw JSONB,
+        nuclear_capacity_mw DECIMAL(10,2),
+        hydro_capacity_mw DECIMAL(10,2),
+        wind_capacity_mw DECIMAL(10,2),
+        solar_capacity_mw DECIMAL(10,2),
+        gas_capacity_mw DECIMAL(10,2),
+        coal_capacity_mw DECIMAL(10,2),
         grid_frequency_hz DECIMAL(4,2) DEFAULT 50.0,
         voltage_levels INTEGER[],
         interconnections TEXT[],
@@ -96,24 +124,24 @@ TABLE_DEFINITIONS = [
     CREATE TABLE IF NOT EXISTS weather.observations (
         timestamp TIMESTAMPTZ NOT NULL,
         location_id TEXT NOT NULL,
-        latitude DECIMAL(10,8),
-        longitude DECIMAL(11,8),
-        temperature_2m_c DECIMAL(5,2),
-        relative_humidity_2m_pct DECIMAL(5,2),
-        dew_point_2m_c DECIMAL(5,2),
-        apparent_temperature_c DECIMAL(5,2),
-        rain_mm DECIMAL(6,2),
-        snowfall_mm DECIMAL(6,2),
-        shortwave_radiation_w_m2 DECIMAL(7,2),
-        wind_speed_10m_kmh DECIMAL(5,2),
-        wind_direction_10m_deg DECIMAL(5,2),
-        wind_gusts_10m_kmh DECIMAL(5,2),
-        cloud_cover_pct DECIMAL(5,2),
-        surface_pressure_hpa DECIMAL(7,2),
-        visibility_m DECIMAL(8,2),
+        latitude DOUBLE PRECISION,
+        longitude DOUBLE PRECISION,
+        temperature_2m_c REAL,
+        relative_humidity_2m_pct REAL,
+        dew_point_2m_c REAL,
+        apparent_temperature_c REAL,
+        rain_mm REAL,
+        snowfall_mm REAL,
+        shortwave_radiation_w_m2 REAL,
+        wind_speed_10m_kmh REAL,
+        wind_direction_10m_deg REAL,
+        wind_gusts_10m_kmh REAL,
+        cloud_cover_pct REAL,
+        surface_pressure_hpa REAL,
+        visibility_m REAL,
         weather_code INTEGER,
         data_provider TEXT,
-        quality_control_flags JSONB,
+        quality_flags INTEGER NOT NULL DEFAULT 0,
         ingestion_timestamp TIMESTAMPTZ DEFAULT NOW(),
         PRIMARY KEY (timestamp, location_id)
     )
@@ -141,7 +169,7 @@ TABLE_DEFINITIONS = [
     # Data ingestion tracking
     """
     CREATE TABLE IF NOT EXISTS metadata.ingestion_log (
-        id SERIAL PRIMARY KEY,
+        id BIGINT GENERATED ALWAYS AS IDENTITY (CACHE 1000) PRIMARY KEY,
         job_name TEXT NOT NULL,
         data_source TEXT NOT NULL,
         start_time TIMESTAMPTZ NOT NULL,
@@ -162,7 +190,7 @@ TABLE_DEFINITIONS = [
     # Data quality metrics
     """
     CREATE TABLE IF NOT EXISTS metadata.quality_metrics (
-        id SERIAL PRIMARY KEY,
+        id BIGINT GENERATED ALWAYS AS IDENTITY (CACHE 1000) PRIMARY KEY,
         table_name TEXT NOT NULL,
         metric_name TEXT NOT NULL,
         metric_value DECIMAL(5,4),
@@ -173,35 +201,86 @@ TABLE_DEFINITIONS = [
         details JSONB,
         created_at TIMESTAMPTZ DEFAULT NOW()
     )
+    """,
+    
+    # Bulk-load staging tables: no WAL, no autovacuum, fully packed pages
+    """
+    CREATE UNLOGGED TABLE IF NOT EXISTS household.consumption_stage
+        (LIKE household.consumption INCLUDING DEFAULTS)
+        WITH (autovacuum_enabled = false, fillfactor = 100)
+    """,
+    
+    """
+    CREATE UNLOGGED TABLE IF NOT EXISTS grid.operations_stage
+        (LIKE grid.operations INCLUDING DEFAULTS)
+        WITH (autovacuum_enabled = false, fillfactor = 100)
+    """,
+    
+    """
+    CREATE UNLOGGED TABLE IF NOT EXISTS weather.observations_stage
+        (LIKE weather.observations INCLUDING DEFAULTS)
+        WITH (autovacuum_enabled = false, fillfactor = 100)
     """
 ]
 
+# UNLOGGED staging table (same schema) that bulk upserts COPY into before merging
+STAGING_TABLES = {
+    ('household', 'consumption'): 'consumption_stage',
+    ('grid', 'operations'): 'operations_stage',
+    ('weather', 'observations'): 'observations_stage'
+}
+
 # Index definitions
 INDEX_DEFINITIONS = [
-    # Household table indexes
+    # Household table indexes (covering the continuous-aggregate inputs for index-only scans)
     """CREATE INDEX IF NOT EXISTS idx_household_consumption_household_id
-       ON household.consumption (household_id, timestamp DESC)""",
+       ON household.consumption (household_id, timestamp DESC)
+       INCLUDE (global_active_power, voltage, sub_metering_1, sub_metering_2, sub_metering_3,
+                data_quality_score)""",
     
     """CREATE INDEX IF NOT EXISTS idx_household_consumption_quality
        ON household.consumption (data_quality_score) WHERE data_quality_score < 0.8""",
     
     # Grid table indexes
     """CREATE INDEX IF NOT EXISTS idx_grid_operations_country
-       ON grid.operations (country_code, timestamp DESC)""",
+       ON grid.operations (country_code, timestamp DESC)
+       INCLUDE (load_actual_mw, solar_generation_actual_mw, wind_onshore_generation_actual_mw,
+                total_generation_mw, price_day_ahead_eur_mwh)""",
     
     """CREATE INDEX IF NOT EXISTS idx_grid_operations_generation
-       ON grid.operations (timestamp DESC) WHERE total_generation_mw IS NOT NULL""",
+       ON grid.operations (timestamp DESC) WHERE total_generation_mw > 0""",
     
     # Weather table indexes
     """CREATE INDEX IF NOT EXISTS idx_weather_observations_location
-       ON weather.observations (location_id, timestamp DESC)""",
+       ON weather.observations (location_id, timestamp DESC)
+       INCLUDE (temperature_2m_c, relative_humidity_2m_pct, rain_mm, shortwave_radiation_w_m2,
+                wind_speed_10m_kmh)""",
     
     # Monitoring indexes
+    """CREATE UNIQUE INDEX IF NOT EXISTS idx_ingestion_log_hash
+       ON metadata.ingestion_log (data_hash) WHERE status = 'success'""",
+    
     """CREATE INDEX IF NOT EXISTS idx_ingestion_log_status
        ON metadata.ingestion_log (status, start_time DESC)""",
     
     """CREATE INDEX IF NOT EXISTS idx_quality_metrics_table
-       ON metadata.quality_metrics (table_name, measurement_time DESC)"""
+       ON metadata.quality_metrics (table_name, measurement_time DESC)""",
+    
+    # Append-only timestamps: BRIN keeps a min/max per page range at a fraction of a B-tree's size
+    """CREATE INDEX IF NOT EXISTS idx_ingestion_log_start_brin
+       ON metadata.ingestion_log USING BRIN (start_time) WITH (pages_per_range = 32)""",
+    
+    """CREATE INDEX IF NOT EXISTS idx_quality_metrics_time_brin
+       ON metadata.quality_metrics USING BRIN (measurement_time) WITH (pages_per_range = 32)""",
+    
+    """CREATE INDEX IF NOT EXISTS idx_household_consumption_ingested_brin
+       ON household.consumption USING BRIN (ingestion_timestamp)""",
+    
+    """CREATE INDEX IF NOT EXISTS idx_grid_operations_ingested_brin
+       ON grid.operations USING BRIN (ingestion_timestamp)""",
+    
+    """CREATE INDEX IF NOT EXISTS idx_weather_observations_ingested_brin
+       ON weather.observations USING BRIN (ingestion_timestamp)"""
 ]
 
 # Column mappings for data processing
@@ -254,4 +333,115 @@ WEATHER_VALIDATION_RANGES = {
     'shortwave_radiation_w_m2': (0, 1500),
     'cloud_cover_pct': (0, 100),
     'visibility_m': (0, 50000)
-}
\ No newline at end of file
+}
+# Server-side range checks; NOT VALID skips re-scanning existing rows, and
+# duplicate_object keeps re-runs idempotent (ADD CONSTRAINT has no IF NOT EXISTS)
+CONSTRAINT_DEFINITIONS = [
+    f"""DO $$ BEGIN
+        ALTER TABLE weather.observations ADD CONSTRAINT chk_{column}
+            CHECK ({column} BETWEEN {low} AND {high}) NOT VALID;
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$"""
+    for column, (low, high) in WEATHER_VALIDATION_RANGES.items()
+]
+
+# Column types changed from DECIMAL since the first schema release, per table
+_RETYPED_COLUMNS = {
+    ('household', 'consumption'): {
+        col: 'REAL' for col in (
+            'global_active_power', 'global_reactive_power', 'voltage', 'global_intensity',
+            'sub_metering_1', 'sub_metering_2', 'sub_metering_3',
+            'calculated_other_consumption', 'data_quality_score'
+        )
+    },
+    ('grid', 'operations'): {
+        **{col: 'DOUBLE PRECISION' for col in (
+            'load_actual_mw', 'load_forecast_mw', 'solar_generation_actual_mw',
+            'wind_onshore_generation_actual_mw', 'wind_offshore_generation_actual_mw',
+            'hydro_generation_actual_mw', 'nuclear_generation_actual_mw',
+            'fossil_generation_actual_mw', 'other_renewable_generation_mw', 'total_generation_mw',
+            'net_import_export_mw'
+        )},
+        'carbon_intensity_g_co2_kwh': 'REAL'
+    },
+    ('weather', 'observations'): {
+        'latitude': 'DOUBLE PRECISION',
+        'longitude': 'DOUBLE PRECISION',
+        **{col: 'REAL' for col in (
+            'temperature_2m_c', 'relative_humidity_2m_pct', 'dew_point_2m_c', 'apparent_temperature_c',
+            'rain_mm', 'snowfall_mm', 'shortwave_radiation_w_m2', 'wind_speed_10m_kmh',
+            'wind_direction_10m_deg', 'wind_gusts_10m_kmh', 'cloud_cover_pct',
+            'surface_pressure_hpa', 'visibility_m'
+        )}
+    }
+}
+
+_CAPACITY_SOURCES = ('nuclear', 'hydro', 'wind', 'solar', 'gas', 'coal')
+
+# Bring tables created by an earlier schema up to TABLE_DEFINITIONS. Every statement
+# checks the catalog first, so re-running them is a no-op; the legacy JSONB columns
+# (grid.operations.data_quality_flags, weather.observations.quality_control_flags,
+# grid.infrastructure.installed_capacity_mw) are kept for the operator to drop
+MIGRATION_DEFINITIONS = [
+    # DECIMAL -> REAL / DOUBLE PRECISION, one table rewrite each (stages included)
+    *(f"""DO $$ BEGIN
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = '{schema}' AND table_name = '{name}'
+                     AND data_type = 'numeric'
+                     AND column_name IN ({', '.join(f"'{col}'" for col in columns)})) THEN
+            ALTER TABLE {schema}.{name}
+                {', '.join(f'ALTER COLUMN {col} TYPE {type_}' for col, type_ in columns.items())};
+        END IF;
+    END $$"""
+      for (schema, table), columns in _RETYPED_COLUMNS.items()
+      for name in (table, STAGING_TABLES[(schema, table)])),
+
+    # Plain total_generation_mw -> generated column (its indexes are dropped with it
+    # and rebuilt by create_indexes)
+    f"""DO $$ BEGIN
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = 'grid' AND table_name = 'operations'
+                     AND column_name = 'total_generation_mw' AND is_generated = 'NEVER') THEN
+            ALTER TABLE grid.operations DROP COLUMN total_generation_mw;
+            ALTER TABLE grid.operations ADD COLUMN total_generation_mw {TOTAL_GENERATION_COLUMN};
+        END IF;
+    END $$""",
+
+    # JSONB quality flags -> QualityFlag bits
+    *(f"ALTER TABLE IF EXISTS {table} ADD COLUMN IF NOT EXISTS quality_flags INTEGER NOT NULL DEFAULT 0"
+      for table in ('grid.operations', 'grid.operations_stage',
+                    'weather.observations', 'weather.observations_stage')),
+
+    # installed_capacity_mw JSONB -> one column per source, backfilled from the JSON
+    "ALTER TABLE grid.infrastructure "
+    + ", ".join(f"ADD COLUMN IF NOT EXISTS {source}_capacity_mw DECIMAL(10,2)" for source in _CAPACITY_SOURCES),
+    f"""DO $$ BEGIN
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = 'grid' AND table_name = 'infrastructure'
+                     AND column_name = 'installed_capacity_mw') THEN
+            UPDATE grid.infrastructure SET
+                {', '.join(f"{source}_capacity_mw = COALESCE({source}_capacity_mw, "
+                           f"(installed_capacity_mw ->> '{source}')::numeric)" for source in _CAPACITY_SOURCES)};
+        END IF;
+    END $$""",
+
+    # SERIAL -> BIGINT identity, continuing after the highest existing id
+    *(f"""DO $$
+    DECLARE
+        seq TEXT := pg_get_serial_sequence('metadata.{table}', 'id');
+    BEGIN
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = 'metadata' AND table_name = '{table}'
+                     AND column_name = 'id' AND is_identity = 'NO') THEN
+            ALTER TABLE metadata.{table} ALTER COLUMN id DROP DEFAULT;
+            IF seq IS NOT NULL THEN
+                EXECUTE 'DROP SEQUENCE ' || seq;
+            END IF;
+            ALTER TABLE metadata.{table} ALTER COLUMN id TYPE BIGINT,
+                ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (CACHE 1000);
+            PERFORM setval(pg_get_serial_sequence('metadata.{table}', 'id'),
+                           COALESCE((SELECT MAX(id) FROM metadata.{table}), 0) + 1, false);
+        END IF;
+    END $$"""
+      for table in ('ingestion_log', 'quality_metrics'))
+]
@@ -4,14 +4,30 @@ Database schema creation and management for TimescaleDB
 """
 
 import logging
-from typing import List, Dict, Tuple
-from sqlalchemy import text
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Optional, Tuple
 
 from database.connection import DatabaseConnection
-from database.models import SCHEMA_DEFINITIONS, TABLE_DEFINITIONS, INDEX_DEFINITIONS
+from database.models import (
+    SCHEMA_DEFINITIONS, TABLE_DEFINITIONS, INDEX_DEFINITIONS, CONSTRAINT_DEFINITIONS,
+    MIGRATION_DEFINITIONS
+)
 
 logger = logging.getLogger(__name__)
 
+# Chunk sizing: the active chunks of one interval should fill ~25% of shared_buffers
+CHUNK_BUFFER_FRACTION = 0.25
+DEFAULT_ROW_BYTES = 150
+MIN_CHUNK_HOURS = 1
+MAX_CHUNK_HOURS = 7 * 24
+
+# Independent per-table DDL runs on up to this many pooled connections at once
+SCHEMA_WORKERS = 4
+
+_INDEX_TARGET = re.compile(r'\bON\s+([\w.]+)', re.IGNORECASE)
+
 
 class SchemaManager:
     """Manages database schema creation and updates"""
@@ -33,6 +49,12 @@ class SchemaManager:
         if not self.create_tables():
             return False
         
+        # Upgrade tables left by an earlier schema version
+        self.migrate_tables()
+        
+        # Add range constraints
+        self.create_constraints()
+        
         # Create hypertables
         self.create_hypertables()
         
@@ -50,12 +72,12 @@ class SchemaManager:
         required_extensions = ['timescaledb', 'cube', 'earthdistance']
         all_installed = True
         
-        for ext in required_extensions:
-            if not self.db.check_extension(ext):
-                if not self.db.install_extension(ext):
-                    all_installed = False
-                    if ext in ['cube', 'earthdistance']:
-                        logger.warning("Spatial indexing will be disabled")
+        missing = [ext for ext in required_extensions if not self.db.check_extension(ext)]
+        for ext, installed in self.db.install_extensions(missing).items():
+            if not installed:
+                all_installed = False
+                if ext in ['cube', 'earthdistance']:
+                    logger.warning("Spatial indexing will be disabled")
                     
         return all_installed
     
@@ -72,58 +94,197 @@ class SchemaManager:
     def create_tables(self) -> bool:
         """Create all database tables"""
         created_count = 0
-        
-        for i, table_sql in enumerate(TABLE_DEFINITIONS):
-            try:
-                self.db.execute_transaction(table_sql)
+
+        try:
+            errors = self.db.execute_batch(TABLE_DEFINITIONS)
+        except Exception as e:
+            logger.error(f"Table creation failed: {e}")
+            return False
+        finally:
+            self.db.invalidate_reflection_cache()
+
+        for i, error in enumerate(errors):
+            if error is None:
                 created_count += 1
                 logger.info(f"Created table {i+1}/{len(TABLE_DEFINITIONS)}")
-            except Exception as e:
-                logger.error(f"Failed to create table {i+1}: {e}")
-                continue
+            else:
+                logger.error(f"Failed to create table {i+1}: {error}")
         
         return created_count > 0
     
+    def migrate_tables(self):
+        """Apply the idempotent column migrations to tables created by an earlier schema"""
+        try:
+            errors = self.db.execute_batch(MIGRATION_DEFINITIONS)
+        except Exception as e:
+            logger.error(f"Table migration failed: {e}")
+            return
+        finally:
+            self.db.invalidate_reflection_cache()
+
+        for error in errors:
+            if error is not None:
+                logger.error(f"Failed to apply migration: {error}")
+        logger.info(f"Applied {errors.count(None)}/{len(MIGRATION_DEFINITIONS)} migrations")
+    
+    def create_constraints(self):
+        """Add the weather range CHECK constraints"""
+        try:
+            errors = self.db.execute_batch(CONSTRAINT_DEFINITIONS)
+        except Exception as e:
+            logger.error(f"Constraint creation failed: {e}")
+            return
+
+        for error in errors:
+            if error is not None:
+                logger.warning(f"Failed to add constraint: {error}")
+        logger.info(f"Applied {errors.count(None)}/{len(CONSTRAINT_DEFINITIONS)} constraints")
+    
     def create_hypertables(self):
         """Create TimescaleDB hypertables"""
+        # (table, time column, fallback chunk interval, space partitioning column,
+        #  hash partitions, expected rows per hour)
         hypertables = [
-            ("household.consumption", "timestamp", "1 day"),
-            ("grid.operations", "timestamp", "6 hours"),
-            ("weather.observations", "timestamp", "12 hours")
+            ("household.consumption", "timestamp", "1 day", "household_id", 4, 60),
+            ("grid.operations", "timestamp", "6 hours", "country_code", 8, 36),
+            ("weather.observations", "timestamp", "12 hours", "location_id", 4, 3)
         ]
         
-        for table, time_column, chunk_interval in hypertables:
-            try:
-                self.db.execute_transaction(
-                    f"""
-                    SELECT create_hypertable('{table}', '{time_column}', 
-                                           chunk_time_interval => INTERVAL '{chunk_interval}',
-                                           if_not_exists => TRUE)
-                    """
-                )
+        buffer_bytes = self._shared_buffers_bytes()
+        statements = []
+        for table, time_column, fallback, space_column, partitions, rows_per_hour in hypertables:
+            chunk_interval = self._chunk_interval(table, rows_per_hour, buffer_bytes, fallback)
+            statements.append(
+                f"""
+                SELECT create_hypertable('{table}', '{time_column}', 
+                                       partitioning_column => '{space_column}',
+                                       number_partitions => {partitions},
+                                       chunk_time_interval => INTERVAL '{chunk_interval}',
+                                       if_not_exists => TRUE)
+                """
+            )
+            # if_not_exists leaves an existing hypertable's interval alone; this resizes
+            # the chunks created from now on
+            statements.append(
+                f"SELECT set_chunk_time_interval('{table}', INTERVAL '{chunk_interval}')"
+            )
+
+        try:
+            errors = self.db.execute_batch(statements)
+        except Exception as e:
+            logger.warning(f"Failed to create hypertables: {e}")
+            return
+
+        for (table, *_), error, interval_error in zip(hypertables, errors[::2], errors[1::2]):
+            if error is None:
                 logger.info(f"Created hypertable: {table}")
-            except Exception as e:
-                logger.warning(f"Failed to create hypertable {table}: {e}")
+            else:
+                logger.warning(f"Failed to create hypertable {table}: {error}")
+            if interval_error is not None:
+                logger.warning(f"Failed to set chunk interval for {table}: {interval_error}")
+
+        self._enable_chunk_skipping([table for table, *_ in hypertables])
+
+    def _enable_chunk_skipping(self, tables: List[str]):
+        """Track per-chunk min/max of ingestion_timestamp so the planner can skip chunks"""
+        # Chunk skipping only covers integer and date/time columns; the TEXT series
+        # keys are left to space partitioning and the segmentby compression settings
+        # SET LOCAL only lets enable_chunk_skipping() run in this transaction; whether the
+        # planner uses the stats is the operator's timescaledb.enable_chunk_skipping setting
+        statements = ["SET LOCAL timescaledb.enable_chunk_skipping = on"] + [
+            f"SELECT enable_chunk_skipping('{table}', 'ingestion_timestamp', if_not_exists => TRUE)"
+            for table in tables
+        ]
+
+        try:
+            errors = self.db.execute_batch(statements)
+        except Exception as e:
+            logger.warning(f"Failed to enable chunk skipping: {e}")
+            return
+
+        for table, error in zip(tables, errors[1:]):
+            if error is not None:
+                logger.warning(f"Chunk skipping not enabled for {table}: {error}")
+    
+    def _shared_buffers_bytes(self) -> Optional[int]:
+        """Return the server's shared_buffers size in bytes, or None if unavailable"""
+        try:
+            return self.db.fetch_scalar(
+                """
+                SELECT setting::bigint * current_setting('block_size')::bigint
+                FROM pg_settings
+                WHERE name = 'shared_buffers'
+                """
+            )
+        except Exception as e:
+            logger.warning(f"Could not read shared_buffers: {e}")
+            return None
+    
+    def _chunk_interval(self, table: str, rows_per_hour: int, buffer_bytes: Optional[int],
+                        fallback: str) -> str:
+        """Size chunk_time_interval so one interval's rows fit the shared_buffers budget"""
+        if not buffer_bytes:
+            return fallback
+        
+        try:
+            # Average row width across the chunks of an existing hypertable (the root
+            # holds no rows); index bytes count too, as they share the buffer budget.
+            # A new or empty table has no size yet and uses DEFAULT_ROW_BYTES
+            row_bytes = self.db.fetch_scalar(
+                """
+                SELECT (hypertable_size(CAST(:table AS regclass))
+                        / NULLIF(approximate_row_count(CAST(:table AS regclass)), 0))::bigint
+                FROM timescaledb_information.hypertables
+                WHERE format('%I.%I', hypertable_schema, hypertable_name)::regclass
+                      = CAST(:table AS regclass)
+                """,
+                {"table": table}
+            ) or DEFAULT_ROW_BYTES
+        except Exception as e:
+            logger.warning(f"Could not estimate row width for {table}: {e}")
+            return fallback
+        
+        hours = int(buffer_bytes * CHUNK_BUFFER_FRACTION / (rows_per_hour * row_bytes))
+        hours = max(MIN_CHUNK_HOURS, min(MAX_CHUNK_HOURS, hours))
+        logger.info(f"Chunk interval for {table}: {hours} hours (~{row_bytes} bytes/row)")
+        return f"{hours} hours"
     
     def create_indexes(self):
         """Create database indexes"""
-        for index_sql in INDEX_DEFINITIONS:
-            try:
-                self.db.execute_transaction(index_sql)
-                logger.info("Created index")
-            except Exception as e:
-                logger.warning(f"Failed to create index: {e}")
-        
+        statements = list(INDEX_DEFINITIONS)
+
         # Try to create spatial index if earthdistance is available
-        if self.db.check_extension('earthdistance'):
+        spatial = self.db.check_extension('earthdistance')
+        if spatial:
+            statements.append(
+                """CREATE INDEX IF NOT EXISTS idx_weather_observations_spatial
+                   ON weather.observations USING GIST (ll_to_earth(latitude, longitude))"""
+            )
+
+        # CREATE INDEX only locks its own table, so each table's indexes are
+        # built in their own transaction, concurrently with the other tables
+        groups: Dict[str, List[int]] = {}
+        for i, index_sql in enumerate(statements):
+            match = _INDEX_TARGET.search(index_sql)
+            groups.setdefault(match.group(1) if match else '', []).append(i)
+
+        def build(positions: List[int]) -> List[Tuple[int, Optional[Exception]]]:
             try:
-                self.db.execute_transaction(
-                    """CREATE INDEX IF NOT EXISTS idx_weather_observations_spatial
-                       ON weather.observations USING GIST (ll_to_earth(latitude, longitude))"""
-                )
-                logger.info("Created spatial index")
+                errors = self.db.execute_batch([statements[i] for i in positions])
             except Exception as e:
-                logger.warning(f"Failed to create spatial index: {e}")
+                errors = [e] * len(positions)
+            return list(zip(positions, errors))
+
+        with ThreadPoolExecutor(max_workers=SCHEMA_WORKERS) as executor:
+            results = [item for group in executor.map(build, groups.values()) for item in group]
+        self.db.invalidate_reflection_cache()
+
+        for i, error in sorted(results, key=lambda item: item[0]):
+            name = "spatial index" if spatial and i == len(INDEX_DEFINITIONS) else "index"
+            if error is None:
+                logger.info(f"Created {name}")
+            else:
+                logger.warning(f"Failed to create {name}: {error}")
     
     def create_roles(self):
         """Create database roles with PostgreSQL version compatibility"""
@@ -216,31 +377,41 @@ class SchemaManager:
     
     def _setup_compression_policies(self, hypertables: List[str]):
         """Setup compression policies for hypertables with data"""
-        compression_intervals = {
-            'consumption': '7 days',
-            'operations': '7 days',
-            'observations': '7 days'
+        # table -> (qualified name, segmentby columns, compress-after interval)
+        compression_settings = {
+            'consumption': ('household.consumption', 'household_id', '7 days'),
+            'operations': ('grid.operations', 'country_code, region_code', '7 days'),
+            'observations': ('weather.observations', 'location_id', '7 days')
         }
         
-        for table in hypertables:
-            if table in compression_intervals:
-                try:
-                    # Enable compression
-                    self.db.execute_transaction(
-                        f"ALTER TABLE {table} SET (timescaledb.compress = true)"
-                    )
-                    
-                    # Add compression policy
-                    self.db.execute_transaction(
-                        f"""
-                        SELECT add_compression_policy('{table}', 
-                                                    INTERVAL '{compression_intervals[table]}',
-                                                    if_not_exists => TRUE)
-                        """
+        def add_policy(table: str):
+            qualified_name, segment_by, interval = compression_settings[table]
+            try:
+                # Enable compression, segmented by series key and ordered by time
+                self.db.execute_transaction(
+                    f"""
+                    ALTER TABLE {qualified_name} SET (
+                        timescaledb.compress = true,
+                        timescaledb.compress_segmentby = '{segment_by}',
+                        timescaledb.compress_orderby = 'timestamp DESC'
                     )
-                    logger.info(f"Added compression policy for {table}")
-                except Exception as e:
-                    logger.warning(f"Failed to add compression policy for {table}: {e}")
+                    """
+                )
+                
+                # Add compression policy
+                self.db.execute_transaction(
+                    f"""
+                    SELECT add_compression_policy('{qualified_name}', 
+                                                INTERVAL '{interval}',
+                                                if_not_exists => TRUE)
+                    """
+                )
+                logger.info(f"Added compression policy for {table}")
+            except Exception as e:
+                logger.warning(f"Failed to add compression policy for {table}: {e}")
+        
+        self._run_concurrently([partial(add_policy, table)
+                                for table in hypertables if table in compression_settings])
     
     def _setup_retention_policies(self, hypertables: List[str]):
         """Setup retention policies for hypertables with data"""
@@ -250,137 +421,216 @@ class SchemaManager:
             'observations': '3 years'
         }
         
-        for table in hypertables:
-            if table in retention_intervals:
-                try:
-                    self.db.execute_transaction(
-                        f"""
-                        SELECT add_retention_policy('{table}', 
-                                                  INTERVAL '{retention_intervals[table]}',
-                                                  if_not_exists => TRUE)
-                        """
-                    )
-                    logger.info(f"Added retention policy for {table}")
-                except Exception as e:
-                    logger.warning(f"Failed to add retention policy for {table}: {e}")
+        def add_policy(table: str):
+            try:
+                self.db.execute_transaction(
+                    f"""
+                    SELECT add_retention_policy('{table}', 
+                                              INTERVAL '{retention_intervals[table]}',
+                                              if_not_exists => TRUE)
+                    """
+                )
+                logger.info(f"Added retention policy for {table}")
+            except Exception as e:
+                logger.warning(f"Failed to add retention policy for {table}: {e}")
+        
+        self._run_concurrently([partial(add_policy, table)
+                                for table in hypertables if table in retention_intervals])
     
     def _setup_continuous_aggregates(self, hypertables: List[str]):
         """Setup continuous aggregates for hypertables with data"""
-        if 'consumption' in hypertables:
-            self._create_household_daily_aggregate()
+        creators = {
+            'consumption': self._create_household_daily_aggregate,
+            'operations': self._create_grid_hourly_aggregate,
+            'observations': self._create_weather_daily_aggregate
+        }
         
-        if 'operations' in hypertables:
-            self._create_grid_hourly_aggregate()
+        # Each aggregate materializes from its own hypertable, so they build concurrently
+        self._run_concurrently([creators[table] for table in hypertables if table in creators])
+    
+    @staticmethod
+    def _run_concurrently(tasks: List):
+        """Run independent per-table tasks on a small thread pool and wait for all of them"""
+        if not tasks:
+            return
+        with ThreadPoolExecutor(max_workers=SCHEMA_WORKERS) as executor:
+            for future in [executor.submit(task) for task in tasks]:
+                future.result()
+    
+    def _create_continuous_aggregate(self, view: str, select_sql: str, start_offset: str,
+                                     end_offset: str, schedule_interval: str):
+        """Create a continuous aggregate and its refresh policy"""
+        self.db.execute_transaction(
+            f"""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS {view}
+            WITH (timescaledb.continuous) AS
+            {select_sql}
+            """
+        )
         
-        if 'observations' in hypertables:
-            self._create_weather_daily_aggregate()
+        # Add refresh policy
+        self.db.execute_transaction(
+            f"""
+            SELECT add_continuous_aggregate_policy('{view}',
+                start_offset => INTERVAL '{start_offset}',
+                end_offset => INTERVAL '{end_offset}',
+                schedule_interval => INTERVAL '{schedule_interval}',
+                if_not_exists => TRUE)
+            """
+        )
+    
+    # Hierarchical rollups: the hourly aggregate is the only one reading the raw
+    # hypertable; daily views roll it up. Hourly levels keep a non-null count
+    # next to each average so the daily averages stay exact (count-weighted).
     
     def _create_household_daily_aggregate(self):
-        """Create daily household consumption aggregate"""
+        """Create hourly and daily household consumption aggregates"""
         try:
-            self.db.execute_transaction(
+            self._create_continuous_aggregate(
+                'household.hourly_consumption',
                 """
-                CREATE MATERIALIZED VIEW IF NOT EXISTS household.daily_consumption
-                WITH (timescaledb.continuous) AS
                 SELECT 
-                    time_bucket('1 day', timestamp) AS day,
+                    time_bucket('1 hour', timestamp) AS hour,
                     household_id,
                     AVG(global_active_power) AS avg_active_power_kw,
+                    COUNT(global_active_power) AS active_power_count,
                     MAX(global_active_power) AS peak_active_power_kw,
-                    SUM(sub_metering_1 + sub_metering_2 + sub_metering_3) / 1000.0 AS total_energy_kwh,
+                    SUM(sub_metering_1 + sub_metering_2 + sub_metering_3) AS total_energy_wh,
                     AVG(voltage) AS avg_voltage_v,
+                    COUNT(voltage) AS voltage_count,
                     COUNT(*) AS measurements_count,
-                    AVG(data_quality_score) AS avg_quality_score
+                    AVG(data_quality_score) AS avg_quality_score,
+                    COUNT(data_quality_score) AS quality_score_count
                 FROM household.consumption
-                GROUP BY day, household_id
-                """
+                GROUP BY hour, household_id
+                """,
+                '3 days', '1 hour', '30 minutes'
             )
             
-            # Add refresh policy
-            self.db.execute_transaction(
-                """
-                SELECT add_continuous_aggregate_policy('daily_consumption',
-                    start_offset => INTERVAL '3 days',
-                    end_offset => INTERVAL '1 hour',
-                    schedule_interval => INTERVAL '1 hour',
-                    if_not_exists => TRUE)
+            self._create_continuous_aggregate(
+                'household.daily_consumption',
                 """
+                SELECT 
+                    time_bucket('1 day', hour) AS day,
+                    household_id,
+                    SUM(avg_active_power_kw * active_power_count)
+                        / NULLIF(SUM(active_power_count), 0) AS avg_active_power_kw,
+                    MAX(peak_active_power_kw) AS peak_active_power_kw,
+                    SUM(total_energy_wh) / 1000.0 AS total_energy_kwh,
+                    SUM(avg_voltage_v * voltage_count) / NULLIF(SUM(voltage_count), 0) AS avg_voltage_v,
+                    SUM(measurements_count) AS measurements_count,
+                    SUM(avg_quality_score * quality_score_count)
+                        / NULLIF(SUM(quality_score_count), 0) AS avg_quality_score
+                FROM household.hourly_consumption
+                GROUP BY day, household_id
+                """,
+                '3 days', '1 hour', '1 hour'
             )
-            logger.info("Created household daily consumption aggregate")
+            logger.info("Created household hourly/daily consumption aggregates")
         except Exception as e:
             logger.warning(f"Failed to create household daily aggregate: {e}")
     
     def _create_grid_hourly_aggregate(self):
-        """Create hourly grid operations aggregate"""
+        """Create hourly and daily grid operations aggregates"""
         try:
-            self.db.execute_transaction(
+            self._create_continuous_aggregate(
+                'grid.hourly_operations',
                 """
-                CREATE MATERIALIZED VIEW IF NOT EXISTS grid.hourly_operations
-                WITH (timescaledb.continuous) AS
                 SELECT 
                     time_bucket('1 hour', timestamp) AS hour,
                     country_code,
                     AVG(load_actual_mw) AS avg_load_mw,
+                    COUNT(load_actual_mw) AS load_count,
                     MAX(load_actual_mw) AS peak_load_mw,
                     AVG(solar_generation_actual_mw) AS avg_solar_mw,
+                    COUNT(solar_generation_actual_mw) AS solar_count,
                     AVG(wind_onshore_generation_actual_mw) AS avg_wind_mw,
+                    COUNT(wind_onshore_generation_actual_mw) AS wind_count,
                     AVG(total_generation_mw) AS avg_total_generation_mw,
+                    COUNT(total_generation_mw) AS total_generation_count,
                     AVG(price_day_ahead_eur_mwh) AS avg_price_eur_mwh,
+                    COUNT(price_day_ahead_eur_mwh) AS price_count,
                     COUNT(*) AS data_points
                 FROM grid.operations
                 GROUP BY hour, country_code
-                """
+                """,
+                '1 day', '15 minutes', '15 minutes'
             )
             
-            # Add refresh policy
-            self.db.execute_transaction(
-                """
-                SELECT add_continuous_aggregate_policy('hourly_operations',
-                    start_offset => INTERVAL '1 day',
-                    end_offset => INTERVAL '15 minutes',
-                    schedule_interval => INTERVAL '15 minutes',
-                    if_not_exists => TRUE)
+            self._create_continuous_aggregate(
+                'grid.daily_operations',
                 """
+                SELECT 
+                    time_bucket('1 day', hour) AS day,
+                    country_code,
+                    SUM(avg_load_mw * load_count) / NULLIF(SUM(load_count), 0) AS avg_load_mw,
+                    MAX(peak_load_mw) AS peak_load_mw,
+                    SUM(avg_solar_mw * solar_count) / NULLIF(SUM(solar_count), 0) AS avg_solar_mw,
+                    SUM(avg_wind_mw * wind_count) / NULLIF(SUM(wind_count), 0) AS avg_wind_mw,
+                    SUM(avg_total_generation_mw * total_generation_count)
+                        / NULLIF(SUM(total_generation_count), 0) AS avg_total_generation_mw,
+                    SUM(avg_price_eur_mwh * price_count) / NULLIF(SUM(price_count), 0) AS avg_price_eur_mwh,
+                    SUM(data_points) AS data_points
+                FROM grid.hourly_operations
+                GROUP BY day, country_code
+                """,
+                '3 days', '1 hour', '1 hour'
             )
-            logger.info("Created grid hourly operations aggregate")
+            logger.info("Created grid hourly/daily operations aggregates")
         except Exception as e:
             logger.warning(f"Failed to create grid hourly aggregate: {e}")
     
     def _create_weather_daily_aggregate(self):
-        """Create daily weather summary aggregate"""
+        """Create hourly and daily weather summary aggregates"""
         try:
-            self.db.execute_transaction(
+            self._create_continuous_aggregate(
+                'weather.hourly_summary',
                 """
-                CREATE MATERIALIZED VIEW IF NOT EXISTS weather.daily_summary
-                WITH (timescaledb.continuous) AS
                 SELECT 
-                    time_bucket('1 day', timestamp) AS day,
+                    time_bucket('1 hour', timestamp) AS hour,
                     location_id,
                     AVG(temperature_2m_c) AS avg_temp_c,
+                    COUNT(temperature_2m_c) AS temp_count,
                     MIN(temperature_2m_c) AS min_temp_c,
                     MAX(temperature_2m_c) AS max_temp_c,
                     AVG(relative_humidity_2m_pct) AS avg_humidity_pct,
+                    COUNT(relative_humidity_2m_pct) AS humidity_count,
                     SUM(rain_mm) AS total_rain_mm,
                     AVG(shortwave_radiation_w_m2) AS avg_solar_radiation_w_m2,
+                    COUNT(shortwave_radiation_w_m2) AS solar_radiation_count,
                     AVG(wind_speed_10m_kmh) AS avg_wind_speed_kmh,
+                    COUNT(wind_speed_10m_kmh) AS wind_speed_count,
                     MAX(wind_speed_10m_kmh) AS max_wind_speed_kmh,
                     COUNT(*) AS observations_count
                 FROM weather.observations
-                GROUP BY day, location_id
-                """
+                GROUP BY hour, location_id
+                """,
+                '2 days', '30 minutes', '30 minutes'
             )
             
-            # Add refresh policy
-            self.db.execute_transaction(
-                """
-                SELECT add_continuous_aggregate_policy('daily_summary',
-                    start_offset => INTERVAL '2 days',
-                    end_offset => INTERVAL '30 minutes',
-                    schedule_interval => INTERVAL '30 minutes',
-                    if_not_exists => TRUE)
+            self._create_continuous_aggregate(
+                'weather.daily_summary',
                 """
+                SELECT 
+                    time_bucket('1 day', hour) AS day,
+                    location_id,
+                    SUM(avg_temp_c * temp_count) / NULLIF(SUM(temp_count), 0) AS avg_temp_c,
+                    MIN(min_temp_c) AS min_temp_c,
+                    MAX(max_temp_c) AS max_temp_c,
+                    SUM(avg_humidity_pct * humidity_count) / NULLIF(SUM(humidity_count), 0) AS avg_humidity_pct,
+                    SUM(total_rain_mm) AS total_rain_mm,
+                    SUM(avg_solar_radiation_w_m2 * solar_radiation_count)
+                        / NULLIF(SUM(solar_radiation_count), 0) AS avg_solar_radiation_w_m2,
+                    SUM(avg_wind_speed_kmh * wind_speed_count)
+                        / NULLIF(SUM(wind_speed_count), 0) AS avg_wind_speed_kmh,
+                    MAX(max_wind_speed_kmh) AS max_wind_speed_kmh,
+                    SUM(observations_count) AS observations_count
+                FROM weather.hourly_summary
+                GROUP BY day, location_id
+                """,
+                '3 days', '1 hour', '1 hour'
             )
-            logger.info("Created weather daily summary aggregate")
+            logger.info("Created weather hourly/daily summary aggregates")
         except Exception as e:
             logger.warning(f"Failed to create weather daily aggregate: {e}")
     
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Optional Arrow/ADBC bulk ingestion backend for hypertable loads
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from config.settings import DatabaseConfig
+from database.connection import _qualify, _quote_ident
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from adbc_driver_postgresql import dbapi as adbc_dbapi
+except ImportError:  # pyarrow / adbc-driver-postgresql are optional
+    pa = None
+    pc = None
+    adbc_dbapi = None
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Column types of the target table, as format_type() spells them
+_COLUMN_TYPES_SQL = """
+    SELECT attname, format_type(atttypid, atttypmod)
+    FROM pg_attribute
+    WHERE attrelid = $1::regclass AND attnum > 0 AND NOT attisdropped
+"""
+
+_NUMERIC_TYPE = re.compile(r'numeric\((\d+),(\d+)\)')
+
+
+def _arrow_type(pg_type: str) -> Optional[pa.DataType]:
+    """Arrow type that binary COPY writes as pg_type, or None to leave the column as is"""
+    simple = {
+        'real': pa.float32(),
+        'double precision': pa.float64(),
+        'smallint': pa.int16(),
+        'integer': pa.int32(),
+        'bigint': pa.int64(),
+        'boolean': pa.bool_(),
+        'text': pa.string(),
+        'date': pa.date32(),
+        'timestamp with time zone': pa.timestamp('us', tz='UTC'),
+        'timestamp without time zone': pa.timestamp('us'),
+    }
+    if pg_type in simple:
+        return simple[pg_type]
+    if pg_type.startswith('character varying'):
+        return pa.string()
+    match = _NUMERIC_TYPE.fullmatch(pg_type)
+    if match:
+        return pa.decimal128(int(match.group(1)), int(match.group(2)))
+    return None
+
+
+def as_arrow(df: pd.DataFrame) -> pa.RecordBatch:
+    """Wrap a DataFrame's column buffers in an Arrow record batch, without a row-wise copy"""
+    return pa.RecordBatch.from_pandas(df, preserve_index=False)
+
+
+class ArrowIngestionBackend:
+    """Pushes DataFrames to PostgreSQL as Arrow record batches via ADBC"""
+
+    def __init__(self, db_config: DatabaseConfig):
+        self.db_config = db_config
+        self._conn = None
+        # Target column types per (schema, table), read from the catalog on first load
+        self._column_types: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+    @staticmethod
+    def available() -> bool:
+        """Whether pyarrow and the ADBC PostgreSQL driver are installed"""
+        return pa is not None and adbc_dbapi is not None
+
+    def _connection(self):
+        """Open the ADBC connection on first use"""
+        if self._conn is None:
+            self._conn = adbc_dbapi.connect(self.db_config.connection_string)
+        return self._conn
+
+    def close(self):
+        """Close the ADBC connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _cast_to_table(self, cursor, schema: str, table: str, batch: pa.RecordBatch) -> pa.RecordBatch:
+        """Cast each column to the Arrow type of its target column; binary COPY needs exact types"""
+        key = (schema, table)
+        if key not in self._column_types:
+            cursor.execute(_COLUMN_TYPES_SQL, (_qualify(schema, table),))
+            self._column_types[key] = dict(cursor.fetchall())
+        column_types = self._column_types[key]
+
+        arrays = []
+        for name, array in zip(batch.schema.names, batch.columns):
+            target = _arrow_type(column_types.get(name, ''))
+            if target is not None and array.type != target:
+                if pa.types.is_dictionary(array.type):
+                    array = array.dictionary_decode()
+                if pa.types.is_decimal(target) and pa.types.is_floating(array.type):
+                    # Float to decimal truncates; round to the scale as Postgres would
+                    array = pc.round(array.cast(pa.float64()), target.scale)
+                array = array.cast(target)
+            arrays.append(array)
+        return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+    def ingest(self, schema: str, table: str, df: pd.DataFrame,
+               conflict_columns: Optional[List[str]] = None,
+               update_columns: Optional[List[str]] = None) -> int:
+        """Append a DataFrame; with conflict columns, stage it and merge with ON CONFLICT"""
+        if df.empty:
+            return 0
+
+        conn = self._connection()
+        try:
+            with conn.cursor() as cursor:
+                arrow_table = self._cast_to_table(cursor, schema, table, as_arrow(df))
+                if not conflict_columns:
+                    count = cursor.adbc_ingest(table, arrow_table, mode="append", db_schema_name=schema)
+                else:
+                    stage = f"_stage_{table}"
+                    column_list = ', '.join(map(_quote_ident, df.columns))
+                    conflict_list = ', '.join(map(_quote_ident, conflict_columns))
+                    if update_columns:
+                        action = "DO UPDATE SET " + ", ".join(
+                            f"{col} = EXCLUDED.{col}" for col in map(_quote_ident, update_columns)
+                        )
+                    else:
+                        action = "DO NOTHING"
+                    cursor.execute(
+                        f"CREATE TEMP TABLE IF NOT EXISTS {_quote_ident(stage)} "
+                        f"(LIKE {_qualify(schema, table)} INCLUDING DEFAULTS)"
+                    )
+                    cursor.adbc_ingest(stage, arrow_table, mode="append", temporary=True)
+                    # One row per key (the last one ingested), as copy_upsert does
+                    cursor.execute(
+                        f"INSERT INTO {_qualify(schema, table)} ({column_list}) "
+                        f"SELECT DISTINCT ON ({conflict_list}) {column_list} "
+                        f"FROM {_quote_ident(stage)} ORDER BY {conflict_list}, ctid DESC "
+                        f"ON CONFLICT ({conflict_list}) {action}"
+                    )
+                    count = cursor.rowcount
+                    cursor.execute(f"DROP TABLE {_quote_ident(stage)}")
+            conn.commit()
+            return count if count is not None and count >= 0 else len(df)
+        except Exception:
+            conn.rollback()
+            raise
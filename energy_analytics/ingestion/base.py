@@ -3,33 +3,231 @@
 Base ingestion pipeline functionality
 """
 
-import json
+from __future__ import annotations
+
 import logging
-import schedule
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
-import pandas as pd
-from sqlalchemy import text
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, Iterable, List, Sequence, Tuple
+from sqlalchemy import Float, bindparam, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.elements import TextClause
 
 from config.settings import DatabaseConfig, IngestionConfig
 from database.connection import DatabaseConnection
+from database.models import STAGING_TABLES
 from database.schema import SchemaManager
+from ingestion.arrow_backend import ArrowIngestionBackend, as_arrow  # noqa: F401 (re-export)
 from monitoring.job_tracking import JobTracker
 
+# pandas is imported where used, so importing a pipeline stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Scheduler timing, in seconds
+SCHEDULER_PREWARM_SECONDS = 30
+SCHEDULER_MAX_BACKOFF = 300
 
-class BaseIngestionPipeline(ABC):
-    """Abstract base class for data ingestion pipelines"""
+# SQLSTATE of a unique_violation, the only IntegrityError a metadata re-insert expects
+UNIQUE_VIOLATION = '23505'
+
+# Transport-level retries inside one http_get; short so a dead endpoint can't stall
+# the scheduler thread (IngestionConfig.retry_delay is for job-level retries)
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+
+# Startup metadata statements, compiled once at import
+_HOUSEHOLD_META_STMT = text("""
+    INSERT INTO household.metadata
+    (household_id, location_name, latitude, longitude, timezone,
+     installation_date, meter_type, sampling_frequency, data_source)
+    VALUES (:household_id, :location_name, :latitude, :longitude, :timezone,
+            :installation_date, :meter_type, :sampling_frequency, :data_source)
+""").bindparams(bindparam('latitude', type_=Float), bindparam('longitude', type_=Float))
+_HOUSEHOLD_TOUCH_STMT = text(
+    "UPDATE household.metadata SET updated_at = NOW() WHERE household_id = :household_id"
+)
+
+_STATION_META_STMT = text("""
+    INSERT INTO weather.stations
+    (location_id, station_name, latitude, longitude, elevation_m,
+     timezone, country_code, region, station_type, data_provider, active_from)
+    VALUES (:location_id, :station_name, :latitude, :longitude, :elevation_m,
+            :timezone, :country_code, :region, :station_type, :data_provider, :active_from)
+""").bindparams(bindparam('latitude', type_=Float), bindparam('longitude', type_=Float),
+                bindparam('elevation_m', type_=Float))
+_STATION_TOUCH_STMT = text(
+    "UPDATE weather.stations SET created_at = NOW() WHERE location_id = :location_id"
+)
+
+_GRID_META_STMT = text("""
+    INSERT INTO grid.infrastructure
+    (region_code, country_code, tso_name, nuclear_capacity_mw, hydro_capacity_mw,
+     wind_capacity_mw, solar_capacity_mw, gas_capacity_mw, coal_capacity_mw,
+     grid_frequency_hz, voltage_levels, interconnections)
+    VALUES (:region_code, :country_code, :tso_name, :nuclear_capacity_mw,
+            :hydro_capacity_mw, :wind_capacity_mw, :solar_capacity_mw,
+            :gas_capacity_mw, :coal_capacity_mw,
+            :grid_frequency_hz, :voltage_levels, :interconnections)
+""").bindparams(bindparam('grid_frequency_hz', type_=Float))
+_GRID_TOUCH_STMT = text(
+    "UPDATE grid.infrastructure SET last_updated = NOW() WHERE region_code = :region_code"
+)
+
+# Static startup metadata, bound straight into the statements above
+_HOUSEHOLD_METADATA = ({
+    'household_id': 'uci_france_001',
+    'location_name': 'Sceaux, France',
+    'latitude': 48.8566,
+    'longitude': 2.3522,
+    'timezone': 'Europe/Paris',
+    'installation_date': '2006-12-01',
+    'meter_type': 'Smart Meter',
+    'sampling_frequency': '1 minute',
+    'data_source': 'UCI ML Repository'
+},)
+
+_WEATHER_STATIONS = (
+    {
+        'location_id': 'paris_fr_001',
+        'station_name': 'Paris Metro Area',
+        'latitude': 48.8566,
+        'longitude': 2.3522,
+        'elevation_m': 35.0,
+        'timezone': 'Europe/Paris',
+        'country_code': 'FR',
+        'region': 'Île-de-France',
+        'station_type': 'reanalysis',
+        'data_provider': 'Open-Meteo ERA5',
+        'active_from': '1940-01-01'
+    },
+    {
+        'location_id': 'berlin_de_001',
+        'station_name': 'Berlin Metro Area',
+        'latitude': 52.5200,
+        'longitude': 13.4050,
+        'elevation_m': 34.0,
+        'timezone': 'Europe/Berlin',
+        'country_code': 'DE',
+        'region': 'Berlin',
+        'station_type': 'reanalysis',
+        'data_provider': 'Open-Meteo ERA5',
+        'active_from': '1940-01-01'
+    },
+    {
+        'location_id': 'madrid_es_001',
+        'station_name': 'Madrid Metro Area',
+        'latitude': 40.4168,
+        'longitude': -3.7038,
+        'elevation_m': 650.0,
+        'timezone': 'Europe/Madrid',
+        'country_code': 'ES',
+        'region': 'Madrid',
+        'station_type': 'reanalysis',
+        'data_provider': 'Open-Meteo ERA5',
+        'active_from': '1940-01-01'
+    }
+)
+
+_GRID_INFRASTRUCTURE = (
+    {
+        'region_code': 'FR',
+        'country_code': 'FR',
+        'tso_name': 'RTE (Réseau de Transport d\'Électricité)',
+        'nuclear_capacity_mw': 63130,
+        'hydro_capacity_mw': 25500,
+        'wind_capacity_mw': 17380,
+        'solar_capacity_mw': 13067,
+        'gas_capacity_mw': 12500,
+        'coal_capacity_mw': 3000,
+        'grid_frequency_hz': 50.0,
+        'voltage_levels': [63, 90, 225, 400],
+        'interconnections': ['ES', 'BE', 'DE', 'CH', 'IT', 'GB']
+    },
+    {
+        'region_code': 'DE',
+        'country_code': 'DE',
+        'tso_name': 'Amprion GmbH',
+        'nuclear_capacity_mw': 8100,
+        'hydro_capacity_mw': 9600,
+        'wind_capacity_mw': 59312,
+        'solar_capacity_mw': 54000,
+        'gas_capacity_mw': 29000,
+        'coal_capacity_mw': 42000,
+        'grid_frequency_hz': 50.0,
+        'voltage_levels': [110, 220, 380],
+        'interconnections': ['FR', 'NL', 'BE', 'LU', 'CH', 'AT', 'CZ', 'PL', 'DK']
+    },
+    {
+        'region_code': 'ES',
+        'country_code': 'ES',
+        'tso_name': 'Red Eléctrica de España (REE)',
+        'nuclear_capacity_mw': 7000,
+        'hydro_capacity_mw': 20300,
+        'wind_capacity_mw': 27446,
+        'solar_capacity_mw': 15000,
+        'gas_capacity_mw': 25000,
+        'coal_capacity_mw': 9500,
+        'grid_frequency_hz': 50.0,
+        'voltage_levels': [132, 220, 400],
+        'interconnections': ['FR', 'PT', 'MA']
+    }
+)
+
+
+def _parse_date(value) -> datetime:
+    """Parse a date argument into a timezone-naive datetime, ISO strings without pandas"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+        except ValueError:
+            pass
+    import pandas as pd
+    return pd.to_datetime(value).to_pydatetime().replace(tzinfo=None)
+
+
+def _next_fire(now: datetime, hour: int, minute: int, weekday: Optional[int]) -> datetime:
+    """Next time after now matching hour:minute, on the given weekday (Monday=0) or daily"""
+    fire = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if weekday is not None:
+        fire += timedelta(days=(weekday - now.weekday()) % 7)
+    if fire <= now:
+        fire += timedelta(days=1 if weekday is None else 7)
+    return fire
+
+
+class _DatabaseMixin:
+    """Shared configuration, connection, schema manager and job tracker setup"""
     
-    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig):
+    def _init_db(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig,
+                 db_connection: Optional[DatabaseConnection] = None,
+                 schema_manager: Optional[SchemaManager] = None,
+                 job_tracker: Optional[JobTracker] = None):
+        """Use the given shared components, building only the ones that are missing"""
         self.db_config = db_config
         self.ingestion_config = ingestion_config
-        self.db_connection = DatabaseConnection(db_config)
-        self.schema_manager = SchemaManager(self.db_connection)
-        self.job_tracker = JobTracker(self.db_connection)
+        self.db_connection = db_connection or DatabaseConnection(db_config)
+        self.schema_manager = schema_manager or SchemaManager(self.db_connection)
+        self.job_tracker = job_tracker or JobTracker(self.db_connection)
+
+
+class BaseIngestionPipeline(_DatabaseMixin, ABC):
+    """Abstract base class for data ingestion pipelines"""
+    
+    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig,
+                 db_connection: Optional[DatabaseConnection] = None,
+                 schema_manager: Optional[SchemaManager] = None,
+                 job_tracker: Optional[JobTracker] = None):
+        # Pipelines started by the orchestrator share its connection, schema manager and tracker
+        self._init_db(db_config, ingestion_config, db_connection, schema_manager, job_tracker)
+        # Arrow/ADBC bulk path, used when the optional dependencies are installed
+        self.arrow_backend = ArrowIngestionBackend(db_config) if ArrowIngestionBackend.available() else None
+        # Keep-alive HTTP session, created on first request
+        self._http_session = None
         
     @abstractmethod
     def ingest_data(self) -> int:
@@ -47,29 +245,118 @@ class BaseIngestionPipeline(ABC):
     
     def disconnect(self):
         """Disconnect from database"""
+        if self.arrow_backend:
+            self.arrow_backend.close()
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
         self.db_connection.disconnect()
     
-    def insert_metadata(self, table: str, data: List[tuple], conflict_column: str = None):
-        """Generic method to insert metadata with conflict handling"""
-        # Implementation will be in specific ingestion classes
-        pass
+    def http_get(self, url: str, **kwargs):
+        """GET through the pipeline's pooled keep-alive session"""
+        if self._http_session is None:
+            self._http_session = self._build_http_session()
+        return self._http_session.get(url, **kwargs)
+
+    def _build_http_session(self):
+        """Session whose adapter pools connections and retries connection errors and 5xx"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Retries and fallback URLs reuse the pooled TCP/TLS connections instead of new handshakes
+        retry = Retry(
+            total=HTTP_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def bulk_copy(self, schema: str, table: str, df: pd.DataFrame,
+                  conflict_columns: Optional[List[str]] = None,
+                  update_columns: Optional[List[str]] = None) -> int:
+        """Load a DataFrame with COPY; with conflict columns, merge through a staging table"""
+        if df.empty:
+            return 0
+
+        # Arrow record batches go over the wire column by column, with no CSV encoding
+        if self.arrow_backend:
+            return self.arrow_backend.ingest(schema, table, df, conflict_columns, update_columns)
+
+        columns = list(df.columns)
+        # The DataFrame is handed over whole so it is serialized column-wise, not row by row
+        rows = df
+        if conflict_columns:
+            return self.db_connection.copy_upsert(
+                table, schema, columns, rows, conflict_columns, update_columns,
+                stage_table=STAGING_TABLES.get((schema, table))
+            )
+        return self.db_connection.copy_insert(table, schema, columns, rows)
+
+    def bulk_upsert(self, table: str, columns: List[str], rows: Iterable[tuple],
+                    conflict_columns: Optional[List[str]] = None, update_set: Optional[str] = None,
+                    page_size: int = 40) -> int:
+        """Multi-row INSERT of tuples into schema.table, with ON CONFLICT on conflict_columns if given"""
+        schema, _, name = table.rpartition('.')
+        return self.db_connection.execute_values(
+            name, schema or 'public', columns, rows, conflict_columns, update_set, page_size
+        )
+
+    def insert_metadata(self, table: str, data: List[tuple], conflict_column: Optional[str] = None,
+                        columns: Optional[List[str]] = None,
+                        update_columns: Optional[List[str]] = None,
+                        conflict_where: Optional[str] = None) -> int:
+        """Bulk insert metadata rows with COPY; on a conflict_column clash, rows are
+        skipped (DO NOTHING) unless update_columns are given (DO UPDATE). A partial
+        unique index is matched by also passing its predicate as conflict_where"""
+        if not data:
+            return 0
+
+        schema, _, name = table.rpartition('.')
+        schema = schema or 'public'
+        if columns is None:
+            # Tuples are positional over the writable columns; identity, serial and
+            # generated columns are filled in by Postgres
+            columns = [
+                col['name'] for col in self.db_connection.get_table_columns(schema, name)
+                if not (col['identity'] or col['computed']
+                        or str(col['default'] or '').startswith('nextval('))
+            ]
+        if len(columns) != len(data[0]):
+            raise ValueError(
+                f"{table}: rows have {len(data[0])} values but {len(columns)} columns: {columns}"
+            )
+
+        if conflict_column:
+            return self.db_connection.copy_upsert(name, schema, columns, data, [conflict_column],
+                                                  update_columns, conflict_where=conflict_where)
+        return self.db_connection.copy_insert(name, schema, columns, data)
 
 
-class DataIngestionPipeline:
+class DataIngestionPipeline(_DatabaseMixin):
     """Main data ingestion pipeline orchestrator"""
     
-    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig):
-        self.db_config = db_config
-        self.ingestion_config = ingestion_config
-        self.db_connection = DatabaseConnection(db_config)
-        self.schema_manager = SchemaManager(self.db_connection)
-        self.job_tracker = JobTracker(self.db_connection)
+    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig,
+                 db_connection: Optional[DatabaseConnection] = None):
+        self._init_db(db_config, ingestion_config, db_connection)
         
         # Initialize specific pipelines (will be imported later)
         self.household_pipeline = None
         self.weather_pipeline = None
         self.grid_pipeline = None
         
+        # Cron table of (hour, minute, weekday or None for daily, job)
+        self._cron: List[Tuple[int, int, Optional[int], Callable[[], Any]]] = []
+        # Set by stop_pipeline to wake the scheduler out of its sleep
+        self._stop_event = threading.Event()
+        
     def start_pipeline(self):
         """Initialize and start the ingestion pipeline"""
         logger.info("Starting Energy Data Ingestion Pipeline")
@@ -95,10 +382,15 @@ class DataIngestionPipeline:
     def stop_pipeline(self):
         """Gracefully stop the pipeline"""
         logger.info("Stopping ingestion pipeline")
-        schedule.clear()
+        self._stop_event.set()
+        self._cron = []
         self.db_connection.disconnect()
         logger.info("Pipeline stopped")
     
+    def seen_hash(self, data_hash: str) -> bool:
+        """Check whether a source file with this hash was already ingested"""
+        return self.job_tracker.seen_hash(data_hash)
+    
     def _initialize_pipelines(self):
         """Initialize specific ingestion pipelines"""
         # Import here to avoid circular imports
@@ -106,197 +398,111 @@ class DataIngestionPipeline:
         from ingestion.weather import WeatherIngestionPipeline
         from ingestion.grid import GridIngestionPipeline
         
-        self.household_pipeline = HouseholdIngestionPipeline(self.db_config, self.ingestion_config)
-        self.weather_pipeline = WeatherIngestionPipeline(self.db_config, self.ingestion_config)
-        self.grid_pipeline = GridIngestionPipeline(self.db_config, self.ingestion_config)
+        shared = dict(db_connection=self.db_connection, schema_manager=self.schema_manager,
+                      job_tracker=self.job_tracker)
+        self.household_pipeline = HouseholdIngestionPipeline(self.db_config, self.ingestion_config, **shared)
+        self.weather_pipeline = WeatherIngestionPipeline(self.db_config, self.ingestion_config, **shared)
+        self.grid_pipeline = GridIngestionPipeline(self.db_config, self.ingestion_config, **shared)
 
     def _insert_initial_metadata(self):
         """Insert initial metadata records"""
-        try:
-            # Insert household metadata
-            household_metadata_sql = """
-                                     INSERT INTO household.metadata
-                                     (household_id, location_name, latitude, longitude, timezone,
-                                      installation_date, meter_type, sampling_frequency, data_source)
-                                     VALUES (:household_id, :location_name, :latitude, :longitude, :timezone,
-                                             :installation_date, :meter_type, :sampling_frequency, \
-                                             :data_source) ON CONFLICT (household_id) DO \
-                                     UPDATE SET updated_at = NOW() \
-                                     """
-
-            household_data = {
-                'household_id': 'uci_france_001',
-                'location_name': 'Sceaux, France',
-                'latitude': 48.8566,
-                'longitude': 2.3522,
-                'timezone': 'Europe/Paris',
-                'installation_date': '2006-12-01',
-                'meter_type': 'Smart Meter',
-                'sampling_frequency': '1 minute',
-                'data_source': 'UCI ML Repository'
-            }
-
-            # Insert weather station metadata
-            weather_metadata_sql = """
-                                   INSERT INTO weather.stations
-                                   (location_id, station_name, latitude, longitude, elevation_m,
-                                    timezone, country_code, region, station_type, data_provider, active_from)
-                                   VALUES (:location_id, :station_name, :latitude, :longitude, :elevation_m,
-                                           :timezone, :country_code, :region, :station_type, :data_provider, \
-                                           :active_from) ON CONFLICT (location_id) DO \
-                                   UPDATE SET created_at = NOW() \
-                                   """
-
-            weather_stations = [
-                {
-                    'location_id': 'paris_fr_001',
-                    'station_name': 'Paris Metro Area',
-                    'latitude': 48.8566,
-                    'longitude': 2.3522,
-                    'elevation_m': 35.0,
-                    'timezone': 'Europe/Paris',
-                    'country_code': 'FR',
-                    'region': 'Île-de-France',
-                    'station_type': 'reanalysis',
-                    'data_provider': 'Open-Meteo ERA5',
-                    'active_from': '1940-01-01'
-                },
-                {
-                    'location_id': 'berlin_de_001',
-                    'station_name': 'Berlin Metro Area',
-                    'latitude': 52.5200,
-                    'longitude': 13.4050,
-                    'elevation_m': 34.0,
-                    'timezone': 'Europe/Berlin',
-                    'country_code': 'DE',
-                    'region': 'Berlin',
-                    'station_type': 'reanalysis',
-                    'data_provider': 'Open-Meteo ERA5',
-                    'active_from': '1940-01-01'
-                },
-                {
-                    'location_id': 'madrid_es_001',
-                    'station_name': 'Madrid Metro Area',
-                    'latitude': 40.4168,
-                    'longitude': -3.7038,
-                    'elevation_m': 650.0,
-                    'timezone': 'Europe/Madrid',
-                    'country_code': 'ES',
-                    'region': 'Madrid',
-                    'station_type': 'reanalysis',
-                    'data_provider': 'Open-Meteo ERA5',
-                    'active_from': '1940-01-01'
-                }
-            ]
-
-            # Insert grid infrastructure metadata
-            grid_metadata_sql = """
-                                INSERT INTO grid.infrastructure
-                                (region_code, country_code, tso_name, installed_capacity_mw,
-                                 grid_frequency_hz, voltage_levels, interconnections)
-                                VALUES (:region_code, :country_code, :tso_name, :installed_capacity_mw,
-                                        :grid_frequency_hz, :voltage_levels, \
-                                        :interconnections) ON CONFLICT (region_code) DO \
-                                UPDATE SET last_updated = NOW() \
-                                """
-
-            # In the grid metadata insertion, change these lines:
-            grid_data = [
-                {
-                    'region_code': 'FR',
-                    'country_code': 'FR',
-                    'tso_name': 'RTE (Réseau de Transport d\'Électricité)',
-                    'installed_capacity_mw': json.dumps(
-                        {'nuclear': 63130, 'hydro': 25500, 'wind': 17380, 'solar': 13067, 'gas': 12500, 'coal': 3000}),
-                    'grid_frequency_hz': 50.0,
-                    'voltage_levels': [63, 90, 225, 400],  # Change from json.dumps to actual array
-                    'interconnections': ['ES', 'BE', 'DE', 'CH', 'IT', 'GB']  # Change from json.dumps to actual array
-                },
-                {
-                    'region_code': 'DE',
-                    'country_code': 'DE',
-                    'tso_name': 'Amprion GmbH',
-                    'installed_capacity_mw': json.dumps(
-                        {'wind': 59312, 'solar': 54000, 'coal': 42000, 'gas': 29000, 'nuclear': 8100, 'hydro': 9600}),
-                    'grid_frequency_hz': 50.0,
-                    'voltage_levels': [110, 220, 380],  # Change from json.dumps to actual array
-                    'interconnections': ['FR', 'NL', 'BE', 'LU', 'CH', 'AT', 'CZ', 'PL', 'DK']
-                    # Change from json.dumps to actual array
-                },
-                {
-                    'region_code': 'ES',
-                    'country_code': 'ES',
-                    'tso_name': 'Red Eléctrica de España (REE)',
-                    'installed_capacity_mw': json.dumps(
-                        {'wind': 27446, 'hydro': 20300, 'solar': 15000, 'nuclear': 7000, 'gas': 25000, 'coal': 9500}),
-                    'grid_frequency_hz': 50.0,
-                    'voltage_levels': [132, 220, 400],  # Change from json.dumps to actual array
-                    'interconnections': ['FR', 'PT', 'MA']  # Change from json.dumps to actual array
-                }
-            ]
+        batches = [
+            (_HOUSEHOLD_META_STMT, _HOUSEHOLD_TOUCH_STMT, _HOUSEHOLD_METADATA),
+            (_STATION_META_STMT, _STATION_TOUCH_STMT, _WEATHER_STATIONS),
+            (_GRID_META_STMT, _GRID_TOUCH_STMT, _GRID_INFRASTRUCTURE)
+        ]
 
-            # Execute insertions
-            self.db_connection.execute_transaction(household_metadata_sql, household_data)
+        def insert(batch):
+            with self.db_connection.begin_transaction() as conn:
+                self._insert_or_touch(conn, *batch)
 
-            for station_data in weather_stations:
-                self.db_connection.execute_transaction(weather_metadata_sql, station_data)
-
-            for grid_info in grid_data:
-                self.db_connection.execute_transaction(grid_metadata_sql, grid_info)
+        try:
+            # The tables are independent: one executemany per table, each on its own pooled connection
+            with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+                list(executor.map(insert, batches))
 
             logger.info("Metadata inserted successfully")
 
         except Exception as e:
             logger.error(f"Metadata insertion failed: {e}")
 
+    @staticmethod
+    def _insert_or_touch(conn, insert_stmt: TextClause, touch_stmt: TextClause,
+                         rows: Sequence[Dict[str, Any]]):
+        """Insert rows without ON CONFLICT; rows that already exist only get their timestamp touched"""
+        # Conflicts are rare after the first start, so try the whole batch as plain INSERTs
+        try:
+            with conn.begin_nested():
+                conn.execute(insert_stmt, rows)
+            return
+        except IntegrityError as e:
+            # NOT NULL, CHECK and foreign key failures are real errors, not existing rows
+            if getattr(e.orig, 'pgcode', None) != UNIQUE_VIOLATION:
+                raise
+
+        for row in rows:
+            try:
+                with conn.begin_nested():
+                    conn.execute(insert_stmt, row)
+            except IntegrityError as e:
+                if getattr(e.orig, 'pgcode', None) != UNIQUE_VIOLATION:
+                    raise
+                conn.execute(touch_stmt, row)
+
     def _schedule_batch_jobs(self):
         """Schedule automated batch processing jobs"""
-        # Schedule daily weather data ingestion at 02:00
-        schedule.every().day.at("02:00").do(self._batch_ingest_weather_data)
-        
-        # Schedule daily grid data ingestion at 03:00
-        schedule.every().day.at("03:00").do(self._batch_ingest_grid_data)
-        
-        # Schedule weekly household data processing on Sundays at 01:00
-        schedule.every().sunday.at("01:00").do(self._batch_process_household_data)
-        
-        # Schedule daily data quality checks at 05:00
-        schedule.every().day.at("05:00").do(self._run_data_quality_checks)
-        
-        # Schedule weekly cleanup at 04:00 on Sundays
-        schedule.every().sunday.at("04:00").do(self._cleanup_old_data)
+        self._cron = [
+            # Daily weather and grid ingestion (plus weekly household processing) at 02:00
+            (2, 0, None, self._run_nightly_ingestion),
+            # Weekly cleanup at 04:00 on Sundays
+            (4, 0, 6, self._cleanup_old_data),
+            # Daily data quality checks at 05:00
+            (5, 0, None, self._run_data_quality_checks)
+        ]
         
         logger.info("Batch jobs scheduled")
     
+    def _run_nightly_ingestion(self):
+        """Run the independent source ingestions concurrently"""
+        jobs = [self._batch_ingest_weather_data, self._batch_ingest_grid_data]
+        # Household files are still only processed once a week, on Sundays
+        if datetime.now().weekday() == 6:
+            jobs.append(self._batch_process_household_data)
+
+        # Each job hits its own source and schema and is I/O bound
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(job) for job in jobs]
+        for future in futures:
+            if future.exception() is not None:
+                logger.error(f"Nightly ingestion job failed: {future.exception()}")
+    
+    def _tracked(self, job, job_name: str, data_source: str):
+        """Run a batch job and log it with one ingestion_log write once it finishes"""
+        start_time = datetime.now()
+        try:
+            records = job()
+            self.job_tracker.record_job(job_name, data_source, "completed", records, start_time)
+        except Exception as e:
+            self.job_tracker.record_job(job_name, data_source, "failed", 0, start_time,
+                                        records_inserted=0, error_message=str(e))
+    
     def _batch_ingest_weather_data(self):
         """Batch ingestion of weather data"""
         if self.weather_pipeline:
-            job_id = self.job_tracker.start_job("batch_weather_ingestion", "Open-Meteo API")
-            try:
-                records = self.weather_pipeline.ingest_batch_data()
-                self.job_tracker.complete_job(job_id, "completed", records, records)
-            except Exception as e:
-                self.job_tracker.complete_job(job_id, "failed", 0, 0, str(e))
+            self._tracked(self.weather_pipeline.ingest_batch_data,
+                          "batch_weather_ingestion", "Open-Meteo API")
     
     def _batch_ingest_grid_data(self):
         """Batch ingestion of grid data"""
         if self.grid_pipeline:
-            job_id = self.job_tracker.start_job("batch_grid_ingestion", "Open Power System Data")
-            try:
-                records = self.grid_pipeline.ingest_batch_data()
-                self.job_tracker.complete_job(job_id, "completed", records, records)
-            except Exception as e:
-                self.job_tracker.complete_job(job_id, "failed", 0, 0, str(e))
+            self._tracked(self.grid_pipeline.ingest_batch_data,
+                          "batch_grid_ingestion", "Open Power System Data")
     
     def _batch_process_household_data(self):
         """Process household consumption data files"""
         if self.household_pipeline:
-            job_id = self.job_tracker.start_job("batch_household_processing", "UCI Household Files")
-            try:
-                records = self.household_pipeline.process_batch_files()
-                self.job_tracker.complete_job(job_id, "completed", records, records)
-            except Exception as e:
-                self.job_tracker.complete_job(job_id, "failed", 0, 0, str(e))
+            self._tracked(self.household_pipeline.process_batch_files,
+                          "batch_household_processing", "UCI Household Files")
     
     def _run_data_quality_checks(self):
         """Run automated data quality checks"""
@@ -313,16 +519,45 @@ class DataIngestionPipeline:
         """Run the job scheduler"""
         logger.info("Starting job scheduler")
         
-        while True:
+        self._stop_event.clear()
+        now = datetime.now()
+        fires = [_next_fire(now, hour, minute, weekday) for hour, minute, weekday, _ in self._cron]
+        backoff = 1
+        while fires and not self._stop_event.is_set():
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                # Sleep until the next job is due instead of polling every minute, waking
+                # a little early to make sure the pool is alive when the job fires
+                next_fire = min(fires)
+                warm_at = (next_fire - datetime.now()).total_seconds() - SCHEDULER_PREWARM_SECONDS
+                if warm_at > 0 and self._stop_event.wait(warm_at):
+                    break
+                self._ensure_connected()
+                if self._stop_event.wait(max((next_fire - datetime.now()).total_seconds(), 0)):
+                    break
+
+                now = datetime.now()
+                for i, (hour, minute, weekday, job) in enumerate(self._cron):
+                    if fires[i] <= now:
+                        # Advance first so a failing job is not re-run until its next slot
+                        fires[i] = _next_fire(now, hour, minute, weekday)
+                        job()
+                backoff = 1
             except KeyboardInterrupt:
                 logger.info("Scheduler stopped by user")
                 break
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
-                time.sleep(300)  # Wait 5 minutes before retrying
+                # Exponential backoff, capped at 5 minutes, then make sure the database is reachable
+                if self._stop_event.wait(backoff):
+                    break
+                backoff = min(backoff * 2, SCHEDULER_MAX_BACKOFF)
+                self._ensure_connected()
+
+    def _ensure_connected(self):
+        """Ping the database and reconnect if the pool has gone stale"""
+        if not self.db_connection.test_connection():
+            logger.warning("Database ping failed, reconnecting")
+            self.db_connection.connect()
 
     def process_historical_data(self, start_date: str = None, end_date: str = None):
         """Process historical data for initial database population"""
@@ -333,12 +568,12 @@ class DataIngestionPipeline:
             if not end_date:
                 end_date = datetime.now().replace(tzinfo=None)  # Ensure timezone-naive
             else:
-                end_date = pd.to_datetime(end_date).replace(tzinfo=None)
+                end_date = _parse_date(end_date)
 
             if not start_date:
                 start_date = (end_date - timedelta(days=30)).replace(tzinfo=None)
             else:
-                start_date = pd.to_datetime(start_date).replace(tzinfo=None)
+                start_date = _parse_date(start_date)
 
             logger.info(f"Processing historical data from {start_date} to {end_date}")
 
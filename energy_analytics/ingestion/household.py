@@ -3,33 +3,102 @@
 Household data ingestion module for UCI Electric Power Consumption dataset
 """
 
+import csv
+import json
 import logging
+import os
+import shutil
+import tempfile
 import zipfile
 from datetime import datetime, timedelta
-from io import BytesIO
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Tuple
 
 import numpy as np
 import pandas as pd
-import requests
 from sqlalchemy import text
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pyarrow is optional; the pandas C parser is the fallback
+    pa = None
+    pa_csv = None
+
+try:
+    import polars as pl
+except ImportError:  # polars is optional; the eager pandas cleaning is the fallback
+    pl = None
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; NumPy in-place arithmetic is the fallback
+    ne = None
+
 from config.settings import DatabaseConfig, IngestionConfig
 from ingestion.base import BaseIngestionPipeline
+from database.connection import DatabaseConnection
+from database.schema import SchemaManager
 from database.models import HOUSEHOLD_COLUMN_MAPPING
+from monitoring.job_tracking import JobTracker
 from monitoring.logging_utils import LogContext, log_dataframe_info
+from utils.helpers import calculate_file_hash
 
 logger = logging.getLogger(__name__)
 
+# Raw UCI measurement columns; missing readings are recorded as '?'
+UCI_NUMERIC_COLUMNS = [col for col in HOUSEHOLD_COLUMN_MAPPING if col not in ('Date', 'Time')]
+# household.consumption columns loaded by the upsert paths, and its primary key
+HOUSEHOLD_UPSERT_COLUMNS = ['timestamp', 'household_id', 'global_active_power', 'global_reactive_power', 'voltage',
+                            'global_intensity', 'sub_metering_1', 'sub_metering_2', 'sub_metering_3',
+                            'calculated_other_consumption', 'data_quality_score', 'source_file']
+HOUSEHOLD_CONFLICT_COLUMNS = ['timestamp', 'household_id']
+# Global active power is in kW averaged over a minute; kW -> Wh per minute
+KW_TO_WH_PER_MINUTE = np.float32(1000.0 / 60.0)
+# DataFrame.attrs flag set by _clean_uci_data when its output already has every upsert column
+_SCHEMA_READY_ATTR = '_household_schema_ready'
+# Readings whose absence lowers a row's data_quality_score
+HOUSEHOLD_REQUIRED_READINGS = ['global_active_power', 'voltage', 'global_intensity']
+
+
+def _uci_timestamps(date: pd.Series, time: pd.Series) -> pd.Series:
+    """Combine 'DD/MM/YYYY' and 'HH:MM:SS' columns into naive datetimes; unparseable rows become NaT"""
+    try:
+        date_bytes = date.to_numpy().astype('S10').view(np.uint8).reshape(-1, 10)
+        time_bytes = time.to_numpy().astype('S8').view(np.uint8).reshape(-1, 8)
+    except (UnicodeEncodeError, ValueError):
+        date_bytes = time_bytes = None
+
+    # Zero-padded fixed-width values are decoded with integer arithmetic on the raw bytes
+    if date_bytes is not None:
+        date_digits = date_bytes[:, [0, 1, 3, 4, 6, 7, 8, 9]].astype(np.int16) - ord('0')
+        time_digits = time_bytes[:, [0, 1, 3, 4, 6, 7]].astype(np.int16) - ord('0')
+        if (((date_digits >= 0) & (date_digits <= 9)).all() and ((time_digits >= 0) & (time_digits <= 9)).all()
+                and (date_bytes[:, [2, 5]] == ord('/')).all() and (time_bytes[:, [2, 5]] == ord(':')).all()):
+            return pd.to_datetime(pd.DataFrame({
+                'year': date_digits[:, 4] * 1000 + date_digits[:, 5] * 100 + date_digits[:, 6] * 10 + date_digits[:, 7],
+                'month': date_digits[:, 2] * 10 + date_digits[:, 3],
+                'day': date_digits[:, 0] * 10 + date_digits[:, 1],
+                'hour': time_digits[:, 0] * 10 + time_digits[:, 1],
+                'minute': time_digits[:, 2] * 10 + time_digits[:, 3],
+                'second': time_digits[:, 4] * 10 + time_digits[:, 5]
+            }, index=date.index), errors='coerce')
+
+    # Unpadded ('1/1/2007') or malformed values take the strptime path
+    return pd.to_datetime(date + ' ' + time, format='%d/%m/%Y %H:%M:%S', errors='coerce')
+
 
 class HouseholdIngestionPipeline(BaseIngestionPipeline):
     """Handles ingestion of household electric power consumption data"""
 
-    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig):
-        super().__init__(db_config, ingestion_config)
+    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig,
+                 db_connection: Optional[DatabaseConnection] = None,
+                 schema_manager: Optional[SchemaManager] = None,
+                 job_tracker: Optional[JobTracker] = None):
+        super().__init__(db_config, ingestion_config, db_connection, schema_manager, job_tracker)
         self.uci_url = "https://archive.ics.uci.edu/static/public/235/individual+household+electric+power+consumption.zip"
         self.household_id = 'uci_france_001'
+        self.cache_dir = Path(ingestion_config.cache_dir) / 'household'
 
     def ingest_data(self) -> int:
         """Main ingestion method for household data"""
@@ -76,38 +145,59 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
         for file_path in household_files:
             logger.info(f"Processing household file: {file_path}")
 
+            # Skip files whose exact content has already been ingested
+            file_hash = calculate_file_hash(file_path)
+            if self.job_tracker.seen_hash(file_hash):
+                logger.info(f"Skipping already ingested file: {file_path}")
+                # Move it out of the input directory so it isn't re-hashed on every run
+                self._archive_file(file_path, archive_dir)
+                continue
+
+            file_size = file_path.stat().st_size
+            file_inserted = 0
+            file_processed = 0
+            job_id = self.job_tracker.start_job('household_file', file_path.name)
+
             try:
-                household_data = self._load_uci_household_file(file_path)
-                if household_data is not None and not household_data.empty:
-                    # Process in chunks
-                    chunk_size = 10000
-                    total_chunks = len(household_data) // chunk_size + 1
-
-                    for i in range(total_chunks):
-                        start_idx = i * chunk_size
-                        end_idx = min((i + 1) * chunk_size, len(household_data))
-                        chunk = household_data.iloc[start_idx:end_idx].copy()
-
-                        if not chunk.empty:
-                            inserted = self._process_household_dataframe(chunk)
-                            records_inserted += inserted
-                            records_processed += len(chunk)
-
-                            if i % 10 == 0:
-                                logger.info(
-                                    f"Processed {i + 1}/{total_chunks} chunks, {records_inserted} records inserted")
-
-                    # Archive processed file
-                    archive_path = archive_dir / f"{file_path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{file_path.suffix}"
-                    file_path.rename(archive_path)
-                    logger.info(f"Archived file to: {archive_path}")
+                # Read, clean and load one chunk at a time instead of slicing a fully loaded file
+                for i, chunk in enumerate(self._iter_uci_household_file(file_path)):
+                    chunk = self._clean_uci_data(chunk)
+                    if chunk.empty:
+                        continue
+
+                    inserted = self._process_household_dataframe(chunk)
+                    file_inserted += inserted
+                    file_processed += len(chunk)
+                    records_inserted += inserted
+                    records_processed += len(chunk)
+
+                    if i % 10 == 0:
+                        logger.info(f"Processed {i + 1} chunks, {records_inserted} records inserted")
+
+                if file_processed:
+                    self._archive_file(file_path, archive_dir)
+                    self.job_tracker.complete_job(job_id, 'success', file_processed, file_inserted,
+                                                  data_hash=file_hash, file_size_bytes=file_size)
+                else:
+                    # No hash recorded, so the file is retried on the next run (e.g. after a parser fix)
+                    logger.warning(f"No valid household records in file: {file_path}")
+                    self.job_tracker.complete_job(job_id, 'empty', 0, 0, file_size_bytes=file_size)
 
             except Exception as e:
                 logger.error(f"Error processing file {file_path}: {e}")
+                self.job_tracker.complete_job(job_id, 'failed', file_processed, file_inserted,
+                                              error_message=str(e))
                 continue
 
         return records_inserted
 
+    @staticmethod
+    def _archive_file(file_path: Path, archive_dir: Path) -> None:
+        """Move a processed input file into the archive directory under a timestamped name"""
+        archive_path = archive_dir / f"{file_path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{file_path.suffix}"
+        file_path.rename(archive_path)
+        logger.info(f"Archived file to: {archive_path}")
+
     def process_historical_data(self, start_date: datetime, end_date: datetime) -> int:
         """Process historical household data for a date range"""
         logger.info(f"Processing historical household data from {start_date} to {end_date}")
@@ -133,20 +223,20 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
         """Validate household data before insertion"""
         initial_count = len(data)
 
-        # Remove rows with invalid timestamps
-        data = data[data.index.notna()]
-
-        # Remove obvious outliers
+        # Invalid timestamps and obvious outliers are dropped with one combined mask
+        keep = data.index.notna()
         if 'global_active_power' in data.columns:
-            data = data[(data['global_active_power'] >= 0) & (data['global_active_power'] <= 20)]
+            power = data['global_active_power'].to_numpy()
+            keep &= (power >= 0) & (power <= 20)
 
         if 'voltage' in data.columns:
-            data = data[(data['voltage'] >= 200) & (data['voltage'] <= 260)]
+            voltage = data['voltage'].to_numpy()
+            keep &= (voltage >= 200) & (voltage <= 260)
+        data = data.iloc[keep] if not keep.all() else data.copy()
 
         # Calculate data quality score
-        required_columns = ['global_active_power', 'voltage', 'global_intensity']
-        null_counts = data[required_columns].isnull().sum(axis=1)
-        data['data_quality_score'] = 1.0 - (null_counts / len(required_columns))
+        missing = data[HOUSEHOLD_REQUIRED_READINGS].isna().to_numpy().sum(axis=1, dtype=np.float32)
+        data['data_quality_score'] = 1.0 - missing / len(HOUSEHOLD_REQUIRED_READINGS)
 
         final_count = len(data)
         if final_count < initial_count:
@@ -200,45 +290,109 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
             logger.info(f"Downloading from: {self.uci_url}")
 
             with LogContext("UCI dataset download", logger):
-                response = requests.get(self.uci_url, timeout=300)
-                response.raise_for_status()
-
-                # Extract and load the data
-                with zipfile.ZipFile(BytesIO(response.content)) as zip_file:
+                # Conditional GET against the cleaned Parquet copy; an unchanged archive costs a 304
+                cache_file = self.cache_dir / 'uci_household.parquet'
+                meta_file = self.cache_dir / 'uci_household.json'
+                headers = {}
+                if pa is not None and cache_file.exists() and meta_file.exists():
+                    meta = json.loads(meta_file.read_text())
+                    if meta.get('etag'):
+                        headers['If-None-Match'] = meta['etag']
+                    if meta.get('last_modified'):
+                        headers['If-Modified-Since'] = meta['last_modified']
+
+                response = self.http_get(self.uci_url, timeout=300, stream=True, headers=headers)
+                if response.status_code == 304:
+                    response.close()
+                    logger.info(f"UCI dataset unchanged, reading cached copy {cache_file}")
+                    return pd.read_parquet(cache_file, memory_map=True)
+
+                validators = {'etag': response.headers.get('ETag'),
+                              'last_modified': response.headers.get('Last-Modified')}
+                try:
+                    response.raise_for_status()
+                    # Spool the archive in 1 MB chunks (in memory up to 64 MB, then on disk)
+                    # rather than holding the body and a BytesIO copy of it
+                    spool = tempfile.SpooledTemporaryFile(max_size=64 << 20)
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, spool, length=1 << 20)
+                finally:
+                    response.close()
+
+                # Extract and load the data, reading the member straight out of the spooled archive
+                spool.seek(0)
+                with spool, zipfile.ZipFile(spool) as zip_file:
                     data_files = [f for f in zip_file.namelist() if f.endswith('.txt') and 'household' in f.lower()]
 
                     if data_files:
                         with zip_file.open(data_files[0]) as data_file:
-                            data = pd.read_csv(data_file, sep=';', encoding='utf-8', low_memory=False)
-                            data = self._clean_uci_data(data)
+                            if pa_csv is not None:
+                                data = self._load_uci_arrow(data_file)
+                            else:
+                                data = self._clean_uci_data(
+                                    pd.read_csv(data_file, sep=';', encoding='utf-8', low_memory=False))
                             logger.info(f"Downloaded and processed UCI dataset: {data.shape}")
+                            self._write_uci_cache(data, cache_file, meta_file, validators)
                             return data
 
         except Exception as e:
             logger.error(f"Failed to download UCI dataset: {e}")
             return None
 
+    def _write_uci_cache(self, data: pd.DataFrame, cache_file: Path, meta_file: Path,
+                         validators: Dict[str, Any]) -> None:
+        """Persist the cleaned dataset as Parquet with the validators of the archive it came from"""
+        if pa is None or not (validators['etag'] or validators['last_modified']):
+            return
+        # Written to a private temp name and renamed, so concurrent workers never see a partial file
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            data.to_parquet(tmp_file, engine='pyarrow', compression='zstd')
+            os.replace(tmp_file, cache_file)
+            meta_file.write_text(json.dumps(validators))
+        except Exception as e:
+            logger.warning(f"Could not cache UCI dataset: {e}")
+        finally:
+            tmp_file.unlink(missing_ok=True)
+
     def _load_uci_household_file(self, file_path: Path) -> Optional[pd.DataFrame]:
         """Load UCI household data from local file"""
         try:
             logger.info(f"Loading household data from: {file_path}")
 
-            # Try different separators and encodings
-            separators = [';', ',', '\t']
-            encodings = ['utf-8', 'iso-8859-1', 'latin1']
+            # Stream typed record batches through Arrow's multi-threaded reader when available
+            if pa_csv is not None:
+                try:
+                    return self._load_uci_arrow(file_path)
+                except (pa.ArrowInvalid, UnicodeDecodeError) as e:
+                    logger.info(f"Arrow could not parse {file_path} ({e}), falling back to pandas")
 
+            # Sniff the separator and encoding from the first 64 KB and commit to a single parse
             data = None
-            for sep in separators:
-                for encoding in encodings:
-                    try:
-                        data = pd.read_csv(file_path, sep=sep, encoding=encoding, low_memory=False)
-                        if data.shape[1] >= 7:  # UCI dataset should have at least 7-9 columns
-                            logger.info(f"Successfully loaded with separator '{sep}' and encoding '{encoding}'")
-                            break
-                    except Exception:
-                        continue
-                if data is not None and data.shape[1] >= 7:
-                    break
+            sep, encoding = self._sniff_csv_format(file_path)
+            try:
+                data = pd.read_csv(file_path, sep=sep, encoding=encoding, low_memory=False)
+                logger.info(f"Successfully loaded with separator '{sep}' and encoding '{encoding}'")
+            except (pd.errors.ParserError, UnicodeDecodeError) as e:
+                logger.info(f"Sniffed format failed for {file_path} ({e}), trying known formats")
+
+            # Otherwise try different separators and encodings
+            if data is None or data.shape[1] < 7:  # UCI dataset should have at least 7-9 columns
+                separators = [';', ',', '\t']
+                encodings = ['utf-8', 'iso-8859-1', 'latin1']
+
+                for sep in separators:
+                    for encoding in encodings:
+                        try:
+                            data = pd.read_csv(file_path, sep=sep, encoding=encoding, low_memory=False)
+                            if data.shape[1] >= 7:
+                                logger.info(f"Successfully loaded with separator '{sep}' and encoding '{encoding}'")
+                                break
+                        except Exception:
+                            continue
+                    if data is not None and data.shape[1] >= 7:
+                        break
 
             if data is None or data.shape[1] < 7:
                 logger.error(f"Could not load data from {file_path}")
@@ -252,34 +406,145 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
             logger.error(f"Error loading household file {file_path}: {e}")
             return None
 
+    @staticmethod
+    def _sniff_csv_format(file_path: Path) -> Tuple[str, str]:
+        """Guess (separator, encoding) of a delimited text file from its first 64 KB"""
+        with open(file_path, 'rb') as f:
+            head = f.read(65536)
+            truncated = bool(f.read(1))
+
+        # A cut may split a multi-byte character at the end, so only earlier errors rule out UTF-8
+        try:
+            text = head.decode('utf-8')
+            encoding = 'utf-8'
+        except UnicodeDecodeError as e:
+            if not truncated or e.start < len(head) - 4:
+                text, encoding = head.decode('iso-8859-1'), 'iso-8859-1'
+            else:
+                text, encoding = head[:e.start].decode('utf-8'), 'utf-8'
+
+        try:
+            sep = csv.Sniffer().sniff(text.rsplit('\n', 1)[0], delimiters=';,\t').delimiter
+        except csv.Error:
+            sep = ';'
+        return sep, encoding
+
+    @staticmethod
+    def _open_uci_arrow(source, block_size: int = 8 << 20, sep: str = ';', encoding: str = 'utf-8'):
+        """Streaming Arrow reader over a delimited UCI file, typed at parse time"""
+        return pa_csv.open_csv(
+            str(source) if isinstance(source, Path) else source,
+            read_options=pa_csv.ReadOptions(block_size=block_size, encoding=encoding),
+            parse_options=pa_csv.ParseOptions(delimiter=sep),
+            convert_options=pa_csv.ConvertOptions(
+                null_values=['?', ''],
+                strings_can_be_null=True,
+                column_types={'Date': pa.string(), 'Time': pa.string(),
+                              **{col: pa.float32() for col in UCI_NUMERIC_COLUMNS}}
+            )
+        )
+
+    def _iter_uci_household_file(self, file_path: Path, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Yield raw UCI chunks so only one is resident at a time"""
+        # Same separator/encoding detection as _load_uci_household_file
+        sep, encoding = self._sniff_csv_format(file_path)
+
+        if pa_csv is not None:
+            # ~40 bytes per UCI line, so size Arrow's blocks to roughly chunksize rows
+            for batch in self._open_uci_arrow(file_path, block_size=chunksize * 40, sep=sep, encoding=encoding):
+                yield batch.to_pandas()
+            return
+
+        yield from pd.read_csv(
+            file_path, sep=sep, encoding=encoding, na_values=['?'], chunksize=chunksize,
+            dtype={'Date': str, 'Time': str, **{col: np.float32 for col in UCI_NUMERIC_COLUMNS}}
+        )
+
+    def _load_uci_arrow(self, source) -> Optional[pd.DataFrame]:
+        """Parse the ';'-separated UCI file batch by batch, cleaning each batch as it arrives"""
+        cleaned = [self._clean_uci_data(batch.to_pandas()) for batch in self._open_uci_arrow(source)]
+        if not cleaned:
+            return None
+        data = pd.concat(cleaned)
+        logger.info(f"Loaded {len(data)} household records with the Arrow CSV reader")
+        return data
+
+    def _clean_uci_polars(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Clean and validate UCI data as one lazy Polars query, collected once"""
+        renames = {raw: ours for raw, ours in HOUSEHOLD_COLUMN_MAPPING.items() if raw in data.columns}
+        columns = [renames.get(col, col) for col in data.columns]
+        numeric_columns = [HOUSEHOLD_COLUMN_MAPPING[col] for col in UCI_NUMERIC_COLUMNS
+                           if HOUSEHOLD_COLUMN_MAPPING[col] in columns]
+
+        # '?' (or any other non-number) becomes null in the same cast that narrows to float32
+        lf = (pl.from_pandas(data).lazy()
+              .rename(renames)
+              .with_columns([pl.col(col).cast(pl.Float32, strict=False) for col in numeric_columns]))
+
+        if 'Date' in columns and 'Time' in columns:
+            # Timezone-naive parse; DST conflicts and bad strings become null and are dropped
+            lf = (lf.with_columns(
+                      pl.concat_str(['Date', 'Time'], separator=' ')
+                      .str.strptime(pl.Datetime, '%d/%m/%Y %H:%M:%S', strict=False)
+                      .alias('datetime'))
+                  .drop(['Date', 'Time'])
+                  .filter(pl.col('datetime').is_not_null()))
+
+        if all(col in columns for col in ['global_active_power', 'sub_metering_1', 'sub_metering_2', 'sub_metering_3']):
+            lf = lf.with_columns(
+                (pl.col('global_active_power') * pl.lit(float(KW_TO_WH_PER_MINUTE), dtype=pl.Float32) - pl.col('sub_metering_1')
+                 - pl.col('sub_metering_2') - pl.col('sub_metering_3')).alias('calculated_other_consumption')
+            )
+
+        # validate_data's outlier filters, pushed into the same scan
+        if 'global_active_power' in columns:
+            lf = lf.filter(pl.col('global_active_power').is_between(0, 20))
+        if 'voltage' in columns:
+            lf = lf.filter(pl.col('voltage').is_between(200, 260))
+
+        null_counts = pl.sum_horizontal([pl.col(col).is_null().cast(pl.Float64) for col in HOUSEHOLD_REQUIRED_READINGS])
+        lf = lf.with_columns(
+            pl.lit(self.household_id).cast(pl.Categorical).alias('household_id'),
+            (1.0 - null_counts / len(HOUSEHOLD_REQUIRED_READINGS)).alias('data_quality_score'),
+            pl.lit('uci_dataset').cast(pl.Categorical).alias('source_file')
+        )
+
+        cleaned = lf.collect().to_pandas()
+        if 'datetime' in cleaned.columns:
+            cleaned = cleaned.set_index('datetime')
+
+        if len(cleaned) < len(data):
+            logger.info(f"Cleaning removed {len(data) - len(cleaned)} invalid records")
+        cleaned.attrs[_SCHEMA_READY_ATTR] = self._schema_ready(cleaned)
+        log_dataframe_info(cleaned, "Cleaned UCI data", logger)
+        return cleaned
+
     def _clean_uci_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Clean and preprocess UCI household data"""
         try:
-            # Rename columns to match our schema
-            for old_name, new_name in HOUSEHOLD_COLUMN_MAPPING.items():
-                if old_name in data.columns:
-                    data.rename(columns={old_name: new_name}, inplace=True)
+            # One fused, parallel query when Polars is installed
+            if pl is not None:
+                return self._clean_uci_polars(data)
 
-                    # Create datetime index - SIMPLIFIED APPROACH
-                    if 'Date' in data.columns and 'Time' in data.columns:
-                        datetime_str = data['Date'] + ' ' + data['Time']
+            # Rename columns to match our schema in one pass (absent columns are ignored)
+            data = data.rename(columns=HOUSEHOLD_COLUMN_MAPPING)
 
-                        # Parse as timezone-naive to avoid DST issues
-                        data['datetime'] = pd.to_datetime(datetime_str,
-                                                          format='%d/%m/%Y %H:%M:%S',
-                                                          errors='coerce')
+            # Create datetime index - SIMPLIFIED APPROACH
+            if 'Date' in data.columns and 'Time' in data.columns:
+                # Parse as timezone-naive to avoid DST issues
+                data['datetime'] = _uci_timestamps(data['Date'], data['Time'])
 
-                        # Remove any failed conversions (DST conflicts will become NaN)
-                        initial_count = len(data)
-                        data = data.dropna(subset=['datetime'])
-                        removed_count = initial_count - len(data)
+                # Remove any failed conversions (DST conflicts will become NaN)
+                initial_count = len(data)
+                data = data.dropna(subset=['datetime'])
+                removed_count = initial_count - len(data)
 
-                        if removed_count > 0:
-                            logger.info(
-                                f"Removed {removed_count} records with invalid timestamps (likely DST transitions)")
+                if removed_count > 0:
+                    logger.info(
+                        f"Removed {removed_count} records with invalid timestamps (likely DST transitions)")
 
-                        data = data.drop(['Date', 'Time'], axis=1)
-                        data.set_index('datetime', inplace=True)
+                data = data.drop(['Date', 'Time'], axis=1)
+                data.set_index('datetime', inplace=True)
 
             # Convert '?' to NaN and then to numeric
             numeric_columns = ['global_active_power', 'global_reactive_power', 'voltage',
@@ -287,21 +552,21 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
 
             for col in numeric_columns:
                 if col in data.columns:
-                    data[col] = pd.to_numeric(data[col].replace('?', np.nan), errors='coerce')
+                    data[col] = pd.to_numeric(data[col].replace('?', np.nan), errors='coerce').astype(np.float32)
 
-            # Add required fields
-            data['household_id'] = self.household_id
+            # Add required fields; the constant labels are categoricals, one int8 code per row
+            data['household_id'] = pd.Categorical.from_codes(np.zeros(len(data), dtype=np.int8),
+                                                             categories=[self.household_id])
             data['data_quality_score'] = 1.0
-            data['source_file'] = 'uci_dataset'
+            data['source_file'] = pd.Categorical.from_codes(np.zeros(len(data), dtype=np.int8),
+                                                            categories=['uci_dataset'])
 
             # Calculate other consumption
             if all(col in data.columns for col in
                    ['global_active_power', 'sub_metering_1', 'sub_metering_2', 'sub_metering_3']):
-                data['calculated_other_consumption'] = (
-                        data['global_active_power'] * 1000 / 60 -  # Convert to Wh
-                        data['sub_metering_1'] -
-                        data['sub_metering_2'] -
-                        data['sub_metering_3']
+                data['calculated_other_consumption'] = self._other_consumption(
+                    data['global_active_power'].to_numpy(), data['sub_metering_1'].to_numpy(),
+                    data['sub_metering_2'].to_numpy(), data['sub_metering_3'].to_numpy()
                 )
 
             # Remove rows with invalid timestamps
@@ -310,6 +575,7 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
             # Validate data
             data = self.validate_data(data)
 
+            data.attrs[_SCHEMA_READY_ATTR] = self._schema_ready(data)
             log_dataframe_info(data, "Cleaned UCI data", logger)
             return data
 
@@ -317,12 +583,40 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
             logger.error(f"Error cleaning UCI data: {e}")
             return data
 
+    @staticmethod
+    def _other_consumption(power: np.ndarray, sub1: np.ndarray, sub2: np.ndarray, sub3: np.ndarray) -> np.ndarray:
+        """Wh not covered by the three sub-meters, computed in one pass without Series temporaries"""
+        if ne is not None:
+            return ne.evaluate('power * k - sub1 - sub2 - sub3',
+                               local_dict={'power': power, 'k': KW_TO_WH_PER_MINUTE,
+                                           'sub1': sub1, 'sub2': sub2, 'sub3': sub3})
+        result = np.multiply(power, KW_TO_WH_PER_MINUTE)
+        np.subtract(result, sub1, out=result)
+        np.subtract(result, sub2, out=result)
+        np.subtract(result, sub3, out=result)
+        return result
+
+    @staticmethod
+    def _schema_ready(data: pd.DataFrame) -> bool:
+        """Whether cleaned data has a naive datetime index and every column the upsert loads"""
+        return (data.index.name == 'datetime' and isinstance(data.index, pd.DatetimeIndex)
+                and data.index.tz is None and all(col in data.columns for col in HOUSEHOLD_UPSERT_COLUMNS[1:]))
+
     def _process_household_dataframe(self, df: pd.DataFrame) -> int:
         """Process and insert household data DataFrame"""
         if df.empty:
             return 0
 
         try:
+            # Output of _clean_uci_data needs no schema repair: index -> localized timestamp column
+            if df.attrs.get(_SCHEMA_READY_ATTR):
+                df = df.rename_axis('timestamp').reset_index()
+                df['timestamp'] = df['timestamp'].dt.tz_localize('Europe/Paris')
+
+                if not self.db_connection.test_connection():
+                    self.connect()
+                return self._upsert_household_data(df)
+
             # Ensure we have the required columns
             required_columns = ['household_id', 'global_active_power', 'global_reactive_power',
                                 'voltage', 'global_intensity', 'sub_metering_1', 'sub_metering_2',
@@ -352,7 +646,7 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
                 return 0
 
             # Convert timestamp to timezone-aware
-            if not pd.api.types.is_datetime64tz_dtype(df['timestamp']):
+            if not isinstance(df['timestamp'].dtype, pd.DatetimeTZDtype):
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
                 if df['timestamp'].dt.tz is None:
                     df['timestamp'] = df['timestamp'].dt.tz_localize('Europe/Paris')
@@ -371,73 +665,40 @@ class HouseholdIngestionPipeline(BaseIngestionPipeline):
 
     def _upsert_household_data(self, df: pd.DataFrame) -> int:
         """Upsert household data with conflict resolution"""
-        try:
-            # First, try to insert directly
-            df.to_sql(
-                'consumption',
-                self.db_connection.engine,
-                schema='household',
-                if_exists='append',
-                index=False,
-                method='multi',
-                chunksize=self.ingestion_config.batch_size
-            )
+        # COPY into the staging table and merge it in one INSERT ... ON CONFLICT DO UPDATE, so
+        # duplicates no longer cost a failed COPY first; ingestion_timestamp isn't loaded, so
+        # EXCLUDED carries the stage's NOW() default
+        update_columns = [col for col in HOUSEHOLD_UPSERT_COLUMNS
+                          if col not in HOUSEHOLD_CONFLICT_COLUMNS + ['source_file']]
+        update_columns.append('ingestion_timestamp')
 
-            logger.info(f"Inserted {len(df)} household records")
-            return len(df)
+        try:
+            inserted_count = self.bulk_copy('household', 'consumption', df[HOUSEHOLD_UPSERT_COLUMNS],
+                                            HOUSEHOLD_CONFLICT_COLUMNS, update_columns)
+            logger.info(f"Upserted {inserted_count} household records")
+            return inserted_count
 
         except Exception as e:
-            # Handle duplicate key errors with upsert
-            if 'duplicate key' in str(e).lower() or 'unique constraint' in str(e).lower():
-                logger.info(f"Handling duplicates with upsert for {len(df)} records")
-                return self._upsert_household_data_manually(df)
-            else:
-                logger.error(f"Household data insertion failed: {e}")
-                return 0
+            logger.warning(f"Staged household upsert failed ({e}), retrying with multi-row inserts")
+            return self._upsert_household_data_manually(df)
 
     def _upsert_household_data_manually(self, df: pd.DataFrame) -> int:
         """Manual upsert for household data with ON CONFLICT"""
         try:
-            upsert_sql = """
-                         INSERT INTO household.consumption
-                         (timestamp, household_id, global_active_power, global_reactive_power, voltage,
-                          global_intensity, sub_metering_1, sub_metering_2, sub_metering_3,
-                          calculated_other_consumption, data_quality_score, source_file)
-                         VALUES (%(timestamp)s, %(household_id)s, %(global_active_power)s, %(global_reactive_power)s,
-                                 %(voltage)s, %(global_intensity)s, %(sub_metering_1)s, %(sub_metering_2)s,
-                                 %(sub_metering_3)s, %(calculated_other_consumption)s, %(data_quality_score)s, \
-                                 %(source_file)s) ON CONFLICT (timestamp, household_id) 
-                DO \
-                         UPDATE SET
-                             global_active_power = EXCLUDED.global_active_power, \
-                             global_reactive_power = EXCLUDED.global_reactive_power, \
-                             voltage = EXCLUDED.voltage, \
-                             global_intensity = EXCLUDED.global_intensity, \
-                             sub_metering_1 = EXCLUDED.sub_metering_1, \
-                             sub_metering_2 = EXCLUDED.sub_metering_2, \
-                             sub_metering_3 = EXCLUDED.sub_metering_3, \
-                             calculated_other_consumption = EXCLUDED.calculated_other_consumption, \
-                             data_quality_score = EXCLUDED.data_quality_score, \
-                             ingestion_timestamp = NOW() \
-                         """
-
-            # Convert DataFrame to records
-            records = df.to_dict('records')
-            inserted_count = 0
-
-            # Process in smaller batches
-            batch_size = 100
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                self.db_connection.execute_many(upsert_sql, batch)
-                inserted_count += len(batch)
-
-                if i % 1000 == 0:  # Log progress
-                    logger.info(f"Upserted {i + len(batch)}/{len(records)} household records")
+            update_set = ', '.join(
+                f"{col} = EXCLUDED.{col}" for col in HOUSEHOLD_UPSERT_COLUMNS[2:-1]
+            ) + ', ingestion_timestamp = NOW()'
+
+            # Plain tuples straight from the columns, sent as multi-row VALUES pages
+            rows = df[HOUSEHOLD_UPSERT_COLUMNS].itertuples(index=False, name=None)
+            inserted_count = self.bulk_upsert(
+                'household.consumption', HOUSEHOLD_UPSERT_COLUMNS, rows,
+                conflict_columns=HOUSEHOLD_CONFLICT_COLUMNS, update_set=update_set, page_size=1000
+            )
 
             logger.info(f"Successfully upserted {inserted_count} household records")
             return inserted_count
 
         except Exception as e:
             logger.error(f"Manual upsert failed: {e}")
-            return 0
\ No newline at end of file
+            return 0
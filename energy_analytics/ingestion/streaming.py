@@ -137,13 +137,7 @@ class StreamingIngestionManager:
                         'source': 'Streaming Simulator'
                     }
 
-                    # Calculate total generation
-                    generation_fields = [
-                        'solar_generation_actual_mw', 'wind_onshore_generation_actual_mw',
-                        'nuclear_generation_actual_mw', 'hydro_generation_actual_mw'
-                    ]
-                    grid_record['total_generation_mw'] = sum(grid_record.get(f, 0) for f in generation_fields)
-
+                    # total_generation_mw is generated by the database from the components
                     self.batch_buffer.append(('grid', grid_record))
 
                 # Wait before next update (grid updates every 15 minutes)
@@ -6,24 +6,61 @@ Weather data ingestion module for Open-Meteo API
 import logging
 import time
 from datetime import datetime, timedelta
+from typing import Optional
 
 import numpy as np
 import pandas as pd
 import requests
 
 from config.settings import DatabaseConfig, IngestionConfig, WEATHER_LOCATIONS
-from database.models import WEATHER_VARIABLE_MAPPING, WEATHER_VALIDATION_RANGES
+from database.connection import DatabaseConnection
+from database.schema import SchemaManager
+from database.models import WEATHER_VARIABLE_MAPPING, WEATHER_VALIDATION_RANGES, QualityFlag
 from ingestion.base import BaseIngestionPipeline
+from monitoring.job_tracking import JobTracker
 from monitoring.logging_utils import LogContext
 
 logger = logging.getLogger(__name__)
 
+# Validation bounds as arrays so a whole batch is range-checked in one NumPy comparison
+_RANGE_COLUMNS = list(WEATHER_VALIDATION_RANGES)
+_RANGE_MIN = np.array([bounds[0] for bounds in WEATHER_VALIDATION_RANGES.values()], dtype=float)
+_RANGE_MAX = np.array([bounds[1] for bounds in WEATHER_VALIDATION_RANGES.values()], dtype=float)
+
+# Upsert column order and conflict clause for the prepared weather INSERT
+WEATHER_UPSERT_COLUMNS = [
+    'timestamp', 'location_id', 'latitude', 'longitude', 'temperature_2m_c', 'relative_humidity_2m_pct',
+    'dew_point_2m_c', 'apparent_temperature_c', 'rain_mm', 'shortwave_radiation_w_m2',
+    'wind_speed_10m_kmh', 'wind_direction_10m_deg', 'wind_gusts_10m_kmh', 'cloud_cover_pct',
+    'surface_pressure_hpa', 'visibility_m', 'data_provider', 'quality_flags'
+]
+WEATHER_UPSERT_CONFLICT = """
+    ON CONFLICT (timestamp, location_id) DO UPDATE SET
+        temperature_2m_c = EXCLUDED.temperature_2m_c,
+        relative_humidity_2m_pct = EXCLUDED.relative_humidity_2m_pct,
+        dew_point_2m_c = EXCLUDED.dew_point_2m_c,
+        apparent_temperature_c = EXCLUDED.apparent_temperature_c,
+        rain_mm = EXCLUDED.rain_mm,
+        shortwave_radiation_w_m2 = EXCLUDED.shortwave_radiation_w_m2,
+        wind_speed_10m_kmh = EXCLUDED.wind_speed_10m_kmh,
+        wind_direction_10m_deg = EXCLUDED.wind_direction_10m_deg,
+        wind_gusts_10m_kmh = EXCLUDED.wind_gusts_10m_kmh,
+        cloud_cover_pct = EXCLUDED.cloud_cover_pct,
+        surface_pressure_hpa = EXCLUDED.surface_pressure_hpa,
+        visibility_m = EXCLUDED.visibility_m,
+        quality_flags = EXCLUDED.quality_flags,
+        ingestion_timestamp = NOW()
+"""
+
 
 class WeatherIngestionPipeline(BaseIngestionPipeline):
     """Handles ingestion of weather data from Open-Meteo API"""
 
-    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig):
-        super().__init__(db_config, ingestion_config)
+    def __init__(self, db_config: DatabaseConfig, ingestion_config: IngestionConfig,
+                 db_connection: Optional[DatabaseConnection] = None,
+                 schema_manager: Optional[SchemaManager] = None,
+                 job_tracker: Optional[JobTracker] = None):
+        super().__init__(db_config, ingestion_config, db_connection, schema_manager, job_tracker)
         self.weather_locations = WEATHER_LOCATIONS
         self.forecast_url = "https://api.open-meteo.com/v1/forecast"
         self.archive_url = "https://archive-api.open-meteo.com/v1/era5"
@@ -126,27 +163,42 @@ class WeatherIngestionPipeline(BaseIngestionPipeline):
             return data
 
         initial_count = len(data)
+        # QualityFlag bits per row, stored in the quality_flags column
+        flags = np.zeros(initial_count, dtype=np.int32)
 
-        # Apply range validation
-        for variable, (min_val, max_val) in WEATHER_VALIDATION_RANGES.items():
-            if variable in data.columns:
-                # Mark out-of-range values as NaN
-                invalid_mask = (data[variable] < min_val) | (data[variable] > max_val)
-                invalid_count = invalid_mask.sum()
+        # Apply range validation to all range-checked columns at once
+        present = np.array([col in data.columns for col in _RANGE_COLUMNS])
+        if present.any():
+            range_cols = [col for col, found in zip(_RANGE_COLUMNS, present) if found]
+            values = data[range_cols].to_numpy(dtype=float, copy=True)
+            invalid_mask = (values < _RANGE_MIN[present]) | (values > _RANGE_MAX[present])
 
+            for variable, invalid_count in zip(range_cols, invalid_mask.sum(axis=0)):
                 if invalid_count > 0:
                     logger.warning(f"Found {invalid_count} out-of-range values for {variable}")
-                    data.loc[invalid_mask, variable] = np.nan
+
+            # Mark out-of-range values as NaN
+            if invalid_mask.any():
+                values[invalid_mask] = np.nan
+                data[range_cols] = values
+                flags[invalid_mask.any(axis=1)] |= QualityFlag.OUT_OF_RANGE
+        data['quality_flags'] = flags
 
         # Remove rows where all weather data is missing
         weather_cols = [col for col in data.columns if
-                        col not in ['timestamp', 'location_id', 'latitude', 'longitude', 'data_provider']]
+                        col not in ['timestamp', 'location_id', 'latitude', 'longitude', 'data_provider',
+                                    'quality_flags']]
         data = data.dropna(subset=weather_cols, how='all')
 
         # Interpolate missing values
-        for col in weather_cols:
-            if col in data.columns:
-                data[col] = data[col].ffill().bfill()
+        if weather_cols:
+            missing = data[weather_cols].isna().to_numpy()
+            data[weather_cols] = data[weather_cols].ffill().bfill()
+            still_missing = data[weather_cols].isna().to_numpy()
+            flags = data['quality_flags'].to_numpy(copy=True)
+            flags[(missing & ~still_missing).any(axis=1)] |= QualityFlag.INTERPOLATED
+            flags[still_missing.any(axis=1)] |= QualityFlag.MISSING_VALUE
+            data['quality_flags'] = flags
 
         final_count = len(data)
         if final_count < initial_count:
@@ -188,7 +240,7 @@ class WeatherIngestionPipeline(BaseIngestionPipeline):
 
             logger.info(f"Fetching weather data from {base_url} for location {location_id}")
 
-            response = requests.get(base_url, params=params, timeout=60)
+            response = self.http_get(base_url, params=params, timeout=60)
             response.raise_for_status()
             data = response.json()
 
@@ -197,37 +249,30 @@ class WeatherIngestionPipeline(BaseIngestionPipeline):
                 logger.error(f"Invalid weather API response for {location_id}")
                 return pd.DataFrame()
 
-            # Process the response
-            weather_records = []
+            # Process the response column-wise: the mapping is resolved once per
+            # response instead of being looked up again for every hourly row
             times = data['hourly']['time']
             hourly_data = data['hourly']
-
-            for i, time_str in enumerate(times):
-                try:
-                    record = {
-                        'timestamp': pd.to_datetime(time_str),
-                        'location_id': location_id,
-                        'latitude': lat,
-                        'longitude': lon,
-                        'data_provider': 'Open-Meteo ERA5' if 'archive-api' in base_url else 'Open-Meteo Forecast'
-                    }
-
-                    # Map API variables to our schema
-                    for api_var, db_var in WEATHER_VARIABLE_MAPPING.items():
-                        if api_var in hourly_data and i < len(hourly_data[api_var]):
-                            value = hourly_data[api_var][i]
-                            record[db_var] = value if value is not None else np.nan
-                        else:
-                            record[db_var] = np.nan
-
-                    weather_records.append(record)
-
-                except Exception as e:
-                    logger.warning(f"Error processing weather record {i}: {e}")
-                    continue
-
-            if weather_records:
-                df = pd.DataFrame(weather_records)
+            row_count = len(times)
+
+            if row_count:
+                columns = {
+                    'timestamp': pd.to_datetime(times),
+                    'location_id': location_id,
+                    'latitude': lat,
+                    'longitude': lon,
+                    'data_provider': 'Open-Meteo ERA5' if 'archive-api' in base_url else 'Open-Meteo Forecast'
+                }
+
+                # Map API variables to our schema; missing or short series are NaN-padded
+                for api_var, db_var in WEATHER_VARIABLE_MAPPING.items():
+                    values = hourly_data.get(api_var) or []
+                    column = np.full(row_count, np.nan)
+                    filled = min(len(values), row_count)
+                    column[:filled] = np.array(values[:filled], dtype=float)
+                    columns[db_var] = column
+
+                df = pd.DataFrame(columns)
 
                 # Ensure timezone awareness
                 if not pd.api.types.is_datetime64tz_dtype(df['timestamp']):
@@ -254,16 +299,8 @@ class WeatherIngestionPipeline(BaseIngestionPipeline):
             return 0
 
         try:
-            # Try direct insert first
-            df.to_sql(
-                'observations',
-                self.db_connection.engine,
-                schema='weather',
-                if_exists='append',
-                index=False,
-                method='multi',
-                chunksize=self.ingestion_config.batch_size
-            )
+            # Try a direct COPY first
+            self.bulk_copy('weather', 'observations', df)
 
             logger.info(f"Inserted {len(df)} weather records")
             return len(df)
@@ -280,42 +317,12 @@ class WeatherIngestionPipeline(BaseIngestionPipeline):
     def _upsert_weather_data(self, df: pd.DataFrame) -> int:
         """Upsert weather data with conflict resolution"""
         try:
-            upsert_sql = """
-                         INSERT INTO weather.observations
-                         (timestamp, location_id, latitude, longitude, temperature_2m_c, relative_humidity_2m_pct,
-                          dew_point_2m_c, apparent_temperature_c, rain_mm, shortwave_radiation_w_m2,
-                          wind_speed_10m_kmh, wind_direction_10m_deg, wind_gusts_10m_kmh, cloud_cover_pct,
-                          surface_pressure_hpa, visibility_m, data_provider)
-                         VALUES (:timestamp, :location_id, :latitude, :longitude, :temperature_2m_c,
-                                 :relative_humidity_2m_pct, :dew_point_2m_c, :apparent_temperature_c,
-                                 :rain_mm, :shortwave_radiation_w_m2, :wind_speed_10m_kmh,
-                                 :wind_direction_10m_deg, :wind_gusts_10m_kmh, :cloud_cover_pct,
-                                 :surface_pressure_hpa, :visibility_m, \
-                                 :data_provider) ON CONFLICT (timestamp, location_id) DO \
-                         UPDATE SET
-                             temperature_2m_c = EXCLUDED.temperature_2m_c, \
-                             relative_humidity_2m_pct = EXCLUDED.relative_humidity_2m_pct, \
-                             dew_point_2m_c = EXCLUDED.dew_point_2m_c, \
-                             apparent_temperature_c = EXCLUDED.apparent_temperature_c, \
-                             rain_mm = EXCLUDED.rain_mm, \
-                             shortwave_radiation_w_m2 = EXCLUDED.shortwave_radiation_w_m2, \
-                             wind_speed_10m_kmh = EXCLUDED.wind_speed_10m_kmh, \
-                             wind_direction_10m_deg = EXCLUDED.wind_direction_10m_deg, \
-                             wind_gusts_10m_kmh = EXCLUDED.wind_gusts_10m_kmh, \
-                             cloud_cover_pct = EXCLUDED.cloud_cover_pct, \
-                             surface_pressure_hpa = EXCLUDED.surface_pressure_hpa, \
-                             visibility_m = EXCLUDED.visibility_m, \
-                             ingestion_timestamp = NOW() \
-                         """
-
-            records = df.to_dict('records')
-            inserted_count = 0
-
-            batch_size = 500
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                self.db_connection.execute_many(upsert_sql, batch)
-                inserted_count += len(batch)
+            values = df[WEATHER_UPSERT_COLUMNS]
+            rows = values.astype(object).where(values.notna(), None).itertuples(index=False, name=None)
+            inserted_count = self.db_connection.execute_prepared(
+                'observations', 'weather', WEATHER_UPSERT_COLUMNS, rows,
+                on_conflict=WEATHER_UPSERT_CONFLICT, page_size=500
+            )
 
             logger.info(f"Successfully upserted {inserted_count} weather records")
             return inserted_count
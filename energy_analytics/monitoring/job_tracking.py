@@ -6,7 +6,6 @@ Job tracking and monitoring functionality
 import logging
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import text
 
 from database.connection import DatabaseConnection
 
@@ -52,7 +51,9 @@ class JobTracker:
         status: str,
         records_processed: int,
         records_inserted: Optional[int] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        data_hash: Optional[str] = None,
+        file_size_bytes: Optional[int] = None
     ):
         """Log job completion"""
         try:
@@ -66,6 +67,8 @@ class JobTracker:
                     records_processed = :records_processed,
                     records_inserted = :records_inserted,
                     error_message = :error_message,
+                    data_hash = COALESCE(:data_hash, data_hash),
+                    file_size_bytes = COALESCE(:file_size_bytes, file_size_bytes),
                     processing_duration_seconds = EXTRACT(EPOCH FROM (:end_time - start_time))
                 WHERE id = :job_id
             """
@@ -78,6 +81,8 @@ class JobTracker:
                     "records_processed": records_processed,
                     "records_inserted": records_inserted,
                     "error_message": error_message,
+                    "data_hash": data_hash,
+                    "file_size_bytes": file_size_bytes,
                     "job_id": job_id
                 }
             )
@@ -90,6 +95,77 @@ class JobTracker:
         except Exception as e:
             logger.error(f"Failed to log job completion: {e}")
     
+    def record_job(
+        self,
+        job_name: str,
+        data_source: str,
+        status: str,
+        records_processed: int,
+        start_time: datetime,
+        end_time: Optional[datetime] = None,
+        records_inserted: Optional[int] = None,
+        error_message: Optional[str] = None,
+        data_hash: Optional[str] = None,
+        file_size_bytes: Optional[int] = None
+    ):
+        """Log a finished job with a single INSERT instead of a start/complete pair"""
+        try:
+            if end_time is None:
+                end_time = datetime.now()
+            if records_inserted is None:
+                records_inserted = records_processed
+            
+            sql = """
+                INSERT INTO metadata.ingestion_log
+                (job_name, data_source, start_time, end_time, status, records_processed,
+                 records_inserted, error_message, data_hash, file_size_bytes,
+                 processing_duration_seconds)
+                VALUES (:job_name, :data_source, :start_time, :end_time, :status, :records_processed,
+                        :records_inserted, :error_message, :data_hash, :file_size_bytes,
+                        :duration_seconds)
+            """
+            
+            self.db.execute_transaction(
+                sql,
+                {
+                    "job_name": job_name,
+                    "data_source": data_source,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "status": status,
+                    "records_processed": records_processed,
+                    "records_inserted": records_inserted,
+                    "error_message": error_message,
+                    "data_hash": data_hash,
+                    "file_size_bytes": file_size_bytes,
+                    "duration_seconds": int((end_time - start_time).total_seconds())
+                }
+            )
+            
+            logger.info(
+                f"Recorded job {job_name} with status {status}, "
+                f"processed {records_processed} records"
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to record job: {e}")
+    
+    def seen_hash(self, data_hash: str) -> bool:
+        """Check whether a source file with this hash was already ingested successfully"""
+        try:
+            return bool(self.db.fetch_scalar(
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM metadata.ingestion_log
+                    WHERE data_hash = :data_hash AND status = 'success'
+                )
+                """,
+                {"data_hash": data_hash}
+            ))
+        except Exception as e:
+            logger.error(f"Failed to look up file hash: {e}")
+            return False
+    
     def get_recent_jobs(self, limit: int = 10) -> list:
         """Get recent job history"""
         try:
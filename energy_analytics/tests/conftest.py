@@ -0,0 +1,41 @@
+"""
+Shared fixtures; database tests run against ENERGY_TEST_DATABASE_URL and are skipped without it
+"""
+
+import os
+
+import pytest
+
+from config.settings import DatabaseConfig
+from database.connection import DatabaseConnection
+from database.schema import SchemaManager
+
+# libpq URL of a scratch database, e.g. postgresql://postgres@localhost/energy_test.
+# Its household, grid, weather and metadata schemas are dropped and recreated.
+TEST_DATABASE_URL = os.environ.get('ENERGY_TEST_DATABASE_URL')
+
+
+@pytest.fixture(scope='session')
+def database_url() -> str:
+    """URL of the scratch database"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("ENERGY_TEST_DATABASE_URL is not set")
+    pytest.importorskip('psycopg2')
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+def db(database_url) -> DatabaseConnection:
+    """Connection to a freshly created schema (without the TimescaleDB parts)"""
+    from sqlalchemy import create_engine
+
+    connection = DatabaseConnection(DatabaseConfig())
+    connection.engine = create_engine(database_url.replace('postgresql://', 'postgresql+psycopg2://', 1))
+    connection.execute_batch(
+        ["DROP SCHEMA IF EXISTS household, grid, weather, metadata CASCADE"]
+    )
+    schema_manager = SchemaManager(connection)
+    assert schema_manager.create_schemas()
+    assert schema_manager.create_tables()
+    yield connection
+    connection.engine.dispose()
@@ -0,0 +1,57 @@
+"""
+Tests for the Arrow/ADBC ingestion backend
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+adbc_dbapi = pytest.importorskip('adbc_driver_postgresql.dbapi')
+
+from ingestion.arrow_backend import ArrowIngestionBackend  # noqa: E402
+
+
+@pytest.fixture
+def backend(db, database_url):
+    backend = ArrowIngestionBackend(db.config)
+    backend._conn = adbc_dbapi.connect(database_url)
+    yield backend
+    backend.close()
+
+
+def _timestamps(periods: int) -> pd.DatetimeIndex:
+    return pd.date_range('2024-01-01', periods=periods, freq='h', tz='UTC')
+
+
+def test_ingest_casts_float64_to_real(db, backend):
+    df = pd.DataFrame({
+        'timestamp': _timestamps(3),
+        'location_id': 'paris',
+        'temperature_2m_c': np.array([1.5, 2.5, 3.5], dtype='float64'),
+        'weather_code': np.array([1, 2, 3], dtype='int64'),
+    })
+
+    assert backend.ingest('weather', 'observations', df) == 3
+    rows = db.execute_query(
+        "SELECT temperature_2m_c, weather_code FROM weather.observations ORDER BY timestamp"
+    ).fetchall()
+    assert rows == [(1.5, 1), (2.5, 2), (3.5, 3)]
+
+
+def test_ingest_merges_float32_and_categorical_into_grid(db, backend):
+    df = pd.DataFrame({
+        'timestamp': _timestamps(2).append(_timestamps(1)),
+        'country_code': pd.Categorical(['FR', 'FR', 'FR']),
+        'region_code': ['FR', 'FR', 'FR'],
+        'load_actual_mw': np.array([100.0, 200.0, 300.0], dtype='float32'),
+        'price_day_ahead_eur_mwh': np.array([50.019, None, 42.5], dtype='float32'),
+    })
+    conflict = ['timestamp', 'country_code', 'region_code']
+
+    # The first timestamp appears twice in the batch; the last row wins
+    assert backend.ingest('grid', 'operations', df, conflict, ['load_actual_mw']) == 2
+    rows = db.execute_query(
+        "SELECT load_actual_mw, price_day_ahead_eur_mwh::float8 FROM grid.operations ORDER BY timestamp"
+    ).fetchall()
+    assert rows == [(300.0, 42.5), (200.0, None)]
@@ -0,0 +1,42 @@
+"""
+Tests for the staged COPY merge in DatabaseConnection
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+GRID_COLUMNS = ['timestamp', 'country_code', 'region_code', 'load_actual_mw']
+GRID_CONFLICT = ['timestamp', 'country_code', 'region_code']
+
+
+def _hour(hour: int) -> datetime:
+    return datetime(2024, 1, 1, hour, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('stage_table', ['operations_stage', None])
+def test_copy_upsert_merges_and_dedupes(db, stage_table):
+    db.copy_upsert('operations', 'grid', GRID_COLUMNS, [(_hour(0), 'FR', 'FR', 1.0)],
+                   GRID_CONFLICT, ['load_actual_mw'], stage_table=stage_table)
+
+    # hour 0 clashes with the stored row and appears twice in the batch; the last copy wins
+    rows = [(_hour(0), 'FR', 'FR', 2.0), (_hour(1), 'FR', 'FR', 5.0), (_hour(0), 'FR', 'FR', 3.0)]
+    assert db.copy_upsert('operations', 'grid', GRID_COLUMNS, rows, GRID_CONFLICT,
+                          ['load_actual_mw'], stage_table=stage_table) == 2
+
+    assert db.execute_query(
+        "SELECT load_actual_mw FROM grid.operations ORDER BY timestamp"
+    ).fetchall() == [(3.0,), (5.0,)]
+    if stage_table:
+        assert db.execute_query("SELECT count(*) FROM grid.operations_stage").scalar() == 0
+
+
+def test_copy_upsert_without_update_columns_keeps_existing_rows(db):
+    db.copy_upsert('operations', 'grid', GRID_COLUMNS, [(_hour(0), 'DE', 'DE', 1.0)], GRID_CONFLICT)
+
+    assert db.copy_upsert('operations', 'grid', GRID_COLUMNS,
+                          [(_hour(0), 'DE', 'DE', 9.0), (_hour(1), 'DE', 'DE', 4.0)],
+                          GRID_CONFLICT) == 1
+    assert db.execute_query(
+        "SELECT load_actual_mw FROM grid.operations ORDER BY timestamp"
+    ).fetchall() == [(1.0,), (4.0,)]
@@ -0,0 +1,55 @@
+"""
+Tests for the OPSD grid data processing
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import DatabaseConfig, IngestionConfig
+from database.models import QualityFlag
+from ingestion.grid import GridIngestionPipeline
+
+
+@pytest.fixture
+def pipeline():
+    return GridIngestionPipeline(DatabaseConfig(), IngestionConfig())
+
+
+def test_process_opsd_data_reshapes_countries(pipeline):
+    raw = pd.DataFrame({
+        'utc_timestamp': ['2024-01-01T00:00:00Z', '2024-01-01T01:00:00Z'],
+        'FR_load_actual_entsoe_transparency': np.array([100, 110], dtype=np.float32),
+        'FR_solar_generation_actual': np.array([10, np.nan], dtype=np.float32),
+        'DE_load_actual_entsoe_transparency': np.array([200, np.nan], dtype=np.float32),
+        'DE_wind_onshore_generation_actual': np.array([20, 30], dtype=np.float32),
+        # Not a supported country
+        'GB_GBN_load_actual_entsoe_transparency': np.array([300, 310], dtype=np.float32),
+    })
+
+    result = pipeline._process_opsd_data(raw).set_index(['timestamp', 'country_code'])
+
+    assert len(result) == 4
+    fr = result.loc[(pd.Timestamp('2024-01-01 00:00'), 'FR')]
+    assert fr['load_actual_mw'] == 100 and fr['total_generation_mw'] == 10
+    assert fr['net_import_export_mw'] == -90
+
+    # A gap in a published series is zero-filled and flagged; DE has no solar column at all
+    assert result['quality_flags'].tolist() == [
+        QualityFlag.NONE, QualityFlag.NONE, QualityFlag.MISSING_VALUE, QualityFlag.MISSING_VALUE
+    ]
+    assert result.loc[(pd.Timestamp('2024-01-01 01:00'), 'DE'), 'load_actual_mw'] == 0
+
+
+def test_process_opsd_data_column_types(pipeline):
+    raw = pd.DataFrame({
+        'utc_timestamp': ['2024-01-01T00:00:00Z'],
+        'ES_load_actual_entsoe_transparency': np.array([50], dtype=np.float32),
+    })
+
+    result = pipeline._process_opsd_data(raw)
+
+    assert result['load_actual_mw'].dtype == np.float32
+    assert list(result['country_code'].cat.categories) == pipeline.supported_countries
+    assert result['region_code'].tolist() == ['ES']
+    assert result['source'].tolist() == ['Open Power System Data']
@@ -0,0 +1,29 @@
+"""
+Tests for the household consumption parsing helpers
+"""
+
+import pandas as pd
+
+from ingestion.household import _uci_timestamps
+
+
+def test_uci_timestamps_fixed_width():
+    result = _uci_timestamps(pd.Series(['16/12/2006', '01/01/2007']), pd.Series(['17:24:00', '00:00:59']))
+
+    assert result.tolist() == [pd.Timestamp('2006-12-16 17:24:00'), pd.Timestamp('2007-01-01 00:00:59')]
+
+
+def test_uci_timestamps_unpadded_and_malformed():
+    # Anything that is not zero-padded falls back to strptime; bad values become NaT
+    result = _uci_timestamps(pd.Series(['1/1/2007', '31/02/2007', '?']),
+                             pd.Series(['0:01:00', '00:00:00', '?']))
+
+    assert result.iloc[0] == pd.Timestamp('2007-01-01 00:01:00')
+    assert result.iloc[1:].isna().all()
+
+
+def test_uci_timestamps_invalid_fixed_width_date():
+    # Well-formed digits for a day that does not exist
+    result = _uci_timestamps(pd.Series(['30/02/2007', '01/03/2007']), pd.Series(['00:00:00', '00:00:00']))
+
+    assert pd.isna(result.iloc[0]) and result.iloc[1] == pd.Timestamp('2007-03-01')
@@ -0,0 +1,134 @@
+"""
+Tests for the shared ingestion pipeline helpers
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from config.settings import IngestionConfig
+from database.models import INDEX_DEFINITIONS
+from ingestion.base import (
+    BaseIngestionPipeline, DataIngestionPipeline, _STATION_META_STMT, _STATION_TOUCH_STMT, _next_fire
+)
+
+
+class _Pipeline(BaseIngestionPipeline):
+    """Minimal concrete pipeline for exercising the base class helpers"""
+
+    def ingest_data(self) -> int:
+        return 0
+
+    def validate_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data
+
+
+@pytest.fixture
+def pipeline(db):
+    pipeline = _Pipeline(db.config, IngestionConfig(), db_connection=db)
+    pipeline.arrow_backend = None
+    return pipeline
+
+
+def _log_row(job_name: str, data_hash: str, status: str = 'success') -> tuple:
+    return (job_name, 'test', datetime(2024, 1, 1), status, data_hash)
+
+
+LOG_COLUMNS = ['job_name', 'data_source', 'start_time', 'status', 'data_hash']
+
+
+def test_insert_metadata_skips_identity_columns(db, pipeline):
+    rows = [('household.consumption', 'completeness', 0.99, datetime(2024, 1, 1))]
+    columns = ['table_name', 'metric_name', 'metric_value', 'measurement_time']
+
+    assert pipeline.insert_metadata('metadata.quality_metrics', rows, columns=columns) == 1
+    assert db.execute_query("SELECT id, metric_name FROM metadata.quality_metrics").fetchall() == [
+        (1, 'completeness')
+    ]
+
+
+def test_insert_metadata_derives_writable_columns(db, pipeline):
+    columns = [col['name'] for col in db.get_table_columns('metadata', 'quality_metrics')]
+    row = ('t', 'm', 0.5, datetime(2024, 1, 1), None, 0.9, 'ok', None, datetime(2024, 1, 1))
+
+    # id is an identity column, so the tuples cover every other column
+    assert columns[0] == 'id' and len(row) == len(columns) - 1
+    assert pipeline.insert_metadata('metadata.quality_metrics', [row]) == 1
+
+    with pytest.raises(ValueError):
+        pipeline.insert_metadata('metadata.quality_metrics', [row[:-1]])
+
+
+def test_insert_metadata_merges_on_partial_unique_index(db, pipeline):
+    db.execute_batch([sql for sql in INDEX_DEFINITIONS if 'idx_ingestion_log_hash' in sql])
+    rows = [_log_row('first', 'abc'), _log_row('second', 'abc'), _log_row('other', 'def')]
+
+    inserted = pipeline.insert_metadata(
+        'metadata.ingestion_log', rows, conflict_column='data_hash', columns=LOG_COLUMNS,
+        update_columns=['job_name'], conflict_where="status = 'success'"
+    )
+    assert inserted == 2
+
+    # A clash with an existing row updates it (DO UPDATE) ...
+    pipeline.insert_metadata(
+        'metadata.ingestion_log', [_log_row('third', 'abc')], conflict_column='data_hash',
+        columns=LOG_COLUMNS, update_columns=['job_name'], conflict_where="status = 'success'"
+    )
+    # ... and without update_columns it is skipped (DO NOTHING)
+    assert pipeline.insert_metadata(
+        'metadata.ingestion_log', [_log_row('fourth', 'def')], conflict_column='data_hash',
+        columns=LOG_COLUMNS, conflict_where="status = 'success'"
+    ) == 0
+
+    assert db.execute_query(
+        "SELECT data_hash, job_name FROM metadata.ingestion_log ORDER BY data_hash"
+    ).fetchall() == [('abc', 'third'), ('def', 'other')]
+
+
+def _station(location_id: str, latitude=48.85) -> dict:
+    return {
+        'location_id': location_id, 'station_name': location_id, 'latitude': latitude,
+        'longitude': 2.35, 'elevation_m': 35.0, 'timezone': 'Europe/Paris', 'country_code': 'FR',
+        'region': 'IDF', 'station_type': 'grid', 'data_provider': 'test',
+        'active_from': datetime(2024, 1, 1).date()
+    }
+
+
+def test_insert_or_touch_touches_existing_rows(db):
+    with db.begin_transaction() as conn:
+        DataIngestionPipeline._insert_or_touch(conn, _STATION_META_STMT, _STATION_TOUCH_STMT,
+                                               [_station('paris')])
+    db.execute_transaction("UPDATE weather.stations SET created_at = '2000-01-01'")
+
+    # One new row and one existing row: the batch insert fails, so rows go one at a time
+    with db.begin_transaction() as conn:
+        DataIngestionPipeline._insert_or_touch(conn, _STATION_META_STMT, _STATION_TOUCH_STMT,
+                                               [_station('paris'), _station('lyon')])
+
+    rows = db.execute_query(
+        "SELECT location_id, created_at > '2000-01-02' FROM weather.stations ORDER BY location_id"
+    ).fetchall()
+    assert rows == [('lyon', True), ('paris', True)]
+
+
+def test_insert_or_touch_raises_other_integrity_errors(db):
+    # latitude is NOT NULL; that must not turn into a touch of an existing row
+    with pytest.raises(IntegrityError):
+        with db.begin_transaction() as conn:
+            DataIngestionPipeline._insert_or_touch(conn, _STATION_META_STMT, _STATION_TOUCH_STMT,
+                                                   [_station('paris', latitude=None)])
+
+
+@pytest.mark.parametrize('now, weekday, expected', [
+    # Daily: later today, or tomorrow once the time has passed (including exactly now)
+    (datetime(2024, 1, 3, 1, 0), None, datetime(2024, 1, 3, 2, 30)),
+    (datetime(2024, 1, 3, 2, 30), None, datetime(2024, 1, 4, 2, 30)),
+    # Weekly on Monday (2024-01-03 is a Wednesday)
+    (datetime(2024, 1, 3, 1, 0), 0, datetime(2024, 1, 8, 2, 30)),
+    (datetime(2024, 1, 8, 1, 0), 0, datetime(2024, 1, 8, 2, 30)),
+    (datetime(2024, 1, 8, 3, 0), 0, datetime(2024, 1, 15, 2, 30)),
+])
+def test_next_fire(now, weekday, expected):
+    assert _next_fire(now, 2, 30, weekday) == expected
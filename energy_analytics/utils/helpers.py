@@ -174,10 +174,13 @@ def calculate_file_hash(file_path: Path, algorithm: str = 'sha256') -> str:
     Returns:
         Hex digest of file hash
     """
-    hash_func = hashlib.new(algorithm)
-    
     with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
+        # hashlib.file_digest (Python 3.11+) hashes straight from the file buffer
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        
+        hash_func = hashlib.new(algorithm)
+        for chunk in iter(lambda: f.read(1 << 20), b''):
             hash_func.update(chunk)
     
     return hash_func.hexdigest()